@@ -145,7 +145,7 @@ def _block_to_note_response(
     return NoteResponse(
         id=block.label,
         user_id=block.user_id,
-        title=block.title or block.label.replace("_", " ").title(),
+        title=block.display_title,
         data=NoteData(
             content=NoteContent(html=html, md=body),
             versions=versions or [],
@@ -194,7 +194,7 @@ async def list_notes(
     notes = []
     for block in blocks:
         updated_at = _datetime_to_nanos(block.updated_at)
-        title = block.title or block.label.replace("_", " ").title()
+        title = block.display_title
 
         notes.append(
             NoteItemResponse(
@@ -44,6 +44,18 @@ def get_workspace_path(user_id: str) -> Path:
     return workspace
 
 
+def get_workspace_sync(
+    user_id: str, openwebui_client: OpenWebUIClient | None = None
+) -> WorkspaceSync:
+    """Create a WorkspaceSync for a user with the configured hash algorithm."""
+    return WorkspaceSync(
+        workspace_path=get_workspace_path(user_id),
+        user_id=user_id,
+        openwebui_client=openwebui_client,
+        hash_algo=get_settings().sync_hash_algo,
+    )
+
+
 def get_openwebui_client() -> OpenWebUIClient | None:
     """Get OpenWebUI client if configured."""
     settings = get_settings()
@@ -61,8 +73,7 @@ async def list_workspace_files(
     refresh: bool = False,
 ) -> WorkspaceIndex:
     """List all files in workspace with hashes."""
-    workspace_path = get_workspace_path(user_id)
-    sync = WorkspaceSync(workspace_path=workspace_path, user_id=user_id)
+    sync = get_workspace_sync(user_id)
 
     if refresh:
         files = await sync.refresh_index()
@@ -85,8 +96,7 @@ async def get_workspace_file(
     path: str,
 ) -> Response:
     """Download file content."""
-    workspace_path = get_workspace_path(user_id)
-    sync = WorkspaceSync(workspace_path=workspace_path, user_id=user_id)
+    sync = get_workspace_sync(user_id)
 
     try:
         content = await sync.read_file(path)
@@ -126,8 +136,7 @@ async def put_workspace_file(
     request: Request,
 ) -> FileMetadataResponse:
     """Upload/update file in workspace."""
-    workspace_path = get_workspace_path(user_id)
-    sync = WorkspaceSync(workspace_path=workspace_path, user_id=user_id)
+    sync = get_workspace_sync(user_id)
 
     content = await request.body()
 
@@ -152,8 +161,7 @@ async def delete_workspace_file(
     path: str,
 ) -> dict[str, bool]:
     """Delete file from workspace."""
-    workspace_path = get_workspace_path(user_id)
-    sync = WorkspaceSync(workspace_path=workspace_path, user_id=user_id)
+    sync = get_workspace_sync(user_id)
 
     try:
         deleted = await sync.delete_file(path)
@@ -172,7 +180,6 @@ async def trigger_sync(
     sync_request: SyncRequest,
 ) -> SyncResult:
     """Trigger workspace sync with OpenWebUI."""
-    workspace_path = get_workspace_path(user_id)
     openwebui_client = get_openwebui_client()
 
     if openwebui_client is None:
@@ -181,29 +188,24 @@ async def trigger_sync(
             detail="OpenWebUI sync not configured. Set RALPH_OPENWEBUI_URL and RALPH_OPENWEBUI_API_KEY.",
         )
 
-    sync = WorkspaceSync(
-        workspace_path=workspace_path,
-        user_id=user_id,
-        openwebui_client=openwebui_client,
-    )
-
     result = SyncResult(success=True)
 
-    if sync_request.direction in ("to_openwebui", "bidirectional"):
-        to_result = await sync.sync_to_openwebui()
-        result.files_uploaded = to_result.files_uploaded
-        result.files_deleted += to_result.files_deleted
-        result.errors.extend(to_result.errors)
-        if not to_result.success:
-            result.success = False
-
-    if sync_request.direction in ("from_openwebui", "bidirectional"):
-        from_result = await sync.sync_from_openwebui()
-        result.files_downloaded = from_result.files_downloaded
-        result.errors.extend(from_result.errors)
-        if not from_result.success:
-            result.success = False
-
-    await openwebui_client.close()
+    async with openwebui_client:
+        sync = get_workspace_sync(user_id, openwebui_client)
+
+        if sync_request.direction in ("to_openwebui", "bidirectional"):
+            to_result = await sync.sync_to_openwebui()
+            result.files_uploaded = to_result.files_uploaded
+            result.files_deleted += to_result.files_deleted
+            result.errors.extend(to_result.errors)
+            if not to_result.success:
+                result.success = False
+
+        if sync_request.direction in ("from_openwebui", "bidirectional"):
+            from_result = await sync.sync_from_openwebui()
+            result.files_downloaded = from_result.files_downloaded
+            result.errors.extend(from_result.errors)
+            if not from_result.success:
+                result.success = False
 
     return result
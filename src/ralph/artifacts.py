@@ -2,21 +2,80 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
-import subprocess
+import hashlib
+import os
+import re
+from itertools import islice
 from typing import TYPE_CHECKING
 
 import httpx
 import structlog
 
 from ralph.config import get_settings
-from ralph.tools.latex_templates import PDF_VIEWER_TEMPLATE
+from ralph.tools.latex_templates import COMPILE_ERROR_TEMPLATE, PDF_VIEWER_TEMPLATE
 
 if TYPE_CHECKING:
     from pathlib import Path
 
 logger = structlog.get_logger()
 
+# Single-pass HTML escaping for text dropped into generated pages
+_HTML_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+
+def _escape_html(text: str) -> str:
+    """Escape HTML special characters in one translate pass."""
+    return text.translate(_HTML_ESCAPES)
+
+
+def _split_template(template: str, *names: str) -> tuple[str, ...]:
+    """Split a %-style template around its named fields, in order, unescaping %%."""
+    parts: list[str] = []
+    rest = template
+    for name in names:
+        head, rest = rest.split(f"%({name})s", 1)
+        parts.append(head.replace("%%", "%"))
+    parts.append(rest.replace("%%", "%"))
+    return tuple(parts)
+
+
+# Static viewer text around the title and PDF data, split and encoded once at import
+_VIEWER_HEAD, _VIEWER_MIDDLE, _VIEWER_TAIL = (
+    part.encode() for part in _split_template(PDF_VIEWER_TEMPLATE, "title", "pdf_base64")
+)
+
+# Compiled PDFs are memoized per document in this directory next to the .tex
+LATEX_CACHE_DIR = ".latex_cache"
+LATEX_CACHE_MAX_ENTRIES = 32
+
+# Documents pulling in other files aren't memoized: edits there wouldn't change the key
+_EXTERNAL_INPUT = re.compile(
+    rb"\\(?:input|include|includegraphics|includepdf|includestandalone|includesvg|bibliography"
+    rb"|addbibresource|import|subimport|subfile|lstinputlisting|verbatiminput|VerbatimInput"
+    rb"|inputminted)\b"
+)
+
+# Classes, packages, and bibliography styles the source loads by name; if one of
+# them is a local file, edits to it wouldn't change the key either
+_LOADED_BY_NAME = re.compile(
+    rb"\\(?:documentclass|LoadClass|usepackage|RequirePackage|bibliographystyle)"
+    rb"\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}"
+)
+_LOADED_SUFFIXES = (".cls", ".sty", ".bst")
+
+# Tectonic diagnostics beyond this many bytes are never decoded or shown
+_STDERR_DECODE_LIMIT = 64 * 1024
+
+# Viewers for PDFs above this size are built off the event loop
+_INLINE_BUILD_LIMIT = 1024 * 1024
+
+# PDF bytes base64-encoded per step; a multiple of 3 so chunks concatenate cleanly
+_B64_CHUNK = 3 * 64 * 1024
+
 
 async def compile_and_push(
     tex_path: Path,
@@ -42,22 +101,19 @@ async def compile_and_push(
         return f"Error: {tex_path.name} is not a .tex file."
 
     # Compile LaTeX → PDF
-    pdf_bytes = _compile_latex(tex_path)
+    pdf_bytes = await _compile_latex(tex_path)
     if isinstance(pdf_bytes, str):
         # Push error to artifact panel so user sees it
-        error_html = (
-            '<html><body style="font-family: sans-serif; padding: 20px;">'
-            '<h2 style="color: #dc3545;">Compilation Error</h2>'
-            '<pre style="background: #f8f9fa; padding: 16px; border-radius: 8px;'
-            f' overflow-x: auto;">{pdf_bytes}</pre>'
-            "</body></html>"
-        )
+        error_html = COMPILE_ERROR_TEMPLATE.substitute(message=_escape_html(pdf_bytes))
         await _push_artifact(user_id, error_html, chat_id=chat_id, title="Compilation Error")
         return pdf_bytes
 
     # Build HTML viewer
     title = tex_path.stem.replace("_", " ").replace("-", " ").title()
-    html = _build_viewer(pdf_bytes, title)
+    if len(pdf_bytes) > _INLINE_BUILD_LIMIT:
+        html = await asyncio.to_thread(_build_viewer, pdf_bytes, title)
+    else:
+        html = _build_viewer(pdf_bytes, title)
 
     # Push to OpenWebUI
     await _push_artifact(user_id, html, chat_id=chat_id, title=title)
@@ -66,46 +122,144 @@ async def compile_and_push(
     return f"PDF compiled ({page_estimate} pages). Displayed in artifact panel."
 
 
-def _compile_latex(tex_path: Path) -> bytes | str:
+async def _compile_latex(tex_path: Path) -> bytes | str:
     """Compile .tex → PDF bytes. Returns error string on failure."""
     work_dir = tex_path.parent
+    pdf_path = tex_path.with_suffix(".pdf")
 
+    cache_path, cached = await asyncio.to_thread(_load_cached_pdf, tex_path)
+    if cached is not None:
+        logger.info("latex_cache_hit", path=str(tex_path))
+        return cached
+
+    # Async subprocess so concurrent compiles on the shared loop don't serialize
     try:
-        result = subprocess.run(  # noqa: S603
-            ["tectonic", "-X", "compile", str(tex_path)],  # noqa: S607
+        proc = await asyncio.create_subprocess_exec(
+            "tectonic",
+            "-X",
+            "compile",
+            str(tex_path),
             cwd=work_dir,
-            capture_output=True,
-            text=True,
-            timeout=120,
-            check=False,
+            env=_tectonic_env(),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        return "Tectonic compiler not installed."
+
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return "Compilation timed out (>120s)."
+
+    if proc.returncode != 0:
+        # Diagnostics are only decoded when they're actually shown, and only the first chunk
+        stderr = stderr[:_STDERR_DECODE_LIMIT]
+        error_msg = (
+            stderr.decode("utf-8", errors="replace") if stderr else "Unknown compilation error"
+        )
+        error_lines = list(
+            islice((line for line in error_msg.splitlines() if "error" in line.lower()), 5)
         )
+        friendly = "\n".join(error_lines) if error_lines else error_msg[:500]
+        return f"LaTeX compilation failed:\n```\n{friendly}\n```"
 
-        if result.returncode != 0:
-            error_msg = result.stderr or result.stdout or "Unknown compilation error"
-            error_lines = [line for line in error_msg.split("\n") if "error" in line.lower()][:5]
-            friendly = "\n".join(error_lines) if error_lines else error_msg[:500]
-            return f"LaTeX compilation failed:\n```\n{friendly}\n```"
+    if not await asyncio.to_thread(pdf_path.exists):
+        return "Compilation succeeded but PDF not found."
 
-        pdf_path = tex_path.with_suffix(".pdf")
-        if not pdf_path.exists():
-            return "Compilation succeeded but PDF not found."
+    pdf_bytes = await asyncio.to_thread(pdf_path.read_bytes)
+    if cache_path is not None:
+        await asyncio.to_thread(_store_cached_pdf, cache_path, pdf_bytes)
+    return pdf_bytes
 
-        return pdf_path.read_bytes()
 
-    except FileNotFoundError:
-        return "Tectonic compiler not installed."
-    except subprocess.TimeoutExpired:
-        return "Compilation timed out (>120s)."
+def _load_cached_pdf(tex_path: Path) -> tuple[Path | None, bytes | None]:
+    """
+    Look up a previously compiled PDF for this exact source.
+
+    Identical self-contained sources (chat retries, no-op saves) reuse the last
+    PDF, which is also restored next to the .tex. Returns the cache slot (None
+    when the source isn't cacheable) and the cached bytes on a hit.
+    """
+    source = tex_path.read_bytes()
+    if _EXTERNAL_INPUT.search(source) or _loads_local_file(tex_path, source):
+        return None, None
+
+    key = hashlib.blake2b(source, digest_size=16).hexdigest()
+    cache_path = tex_path.parent / LATEX_CACHE_DIR / f"{key}.pdf"
+    if not cache_path.exists():
+        return cache_path, None
+
+    pdf_bytes = cache_path.read_bytes()
+    # Refresh the entry so eviction drops the least recently used PDFs
+    os.utime(cache_path)
+    tex_path.with_suffix(".pdf").write_bytes(pdf_bytes)
+    return cache_path, pdf_bytes
+
+
+def _loads_local_file(tex_path: Path, source: bytes) -> bool:
+    """Check whether a class, package, or style the source loads sits next to the .tex."""
+    for match in _LOADED_BY_NAME.finditer(source):
+        for raw_name in match.group(1).decode(errors="replace").split(","):
+            name = raw_name.strip()
+            if name and any(
+                (tex_path.parent / f"{name}{suffix}").is_file() for suffix in _LOADED_SUFFIXES
+            ):
+                return True
+    return False
+
+
+def _tectonic_env() -> dict[str, str] | None:
+    """Environment for tectonic, sharing one package cache across compiles when configured."""
+    cache_dir = get_settings().tectonic_cache_dir
+    if not cache_dir:
+        return None
+    return {**os.environ, "TECTONIC_CACHE_DIR": cache_dir}
+
+
+def _store_cached_pdf(cache_path: Path, pdf_bytes: bytes) -> None:
+    """Save a compiled PDF, keeping only the LATEX_CACHE_MAX_ENTRIES most recently used."""
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        cache_path.write_bytes(pdf_bytes)
+        entries = sorted(
+            cache_path.parent.glob("*.pdf"), key=lambda p: p.stat().st_mtime, reverse=True
+        )
+        for stale in entries[LATEX_CACHE_MAX_ENTRIES:]:
+            stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("latex_cache_write_failed", path=str(cache_path), error=str(e))
 
 
 def _build_viewer(pdf_bytes: bytes, title: str) -> str:
-    """Build self-contained HTML PDF viewer."""
-    pdf_base64 = base64.b64encode(pdf_bytes).decode("ascii")
+    """
+    Build self-contained HTML PDF viewer.
+
+    The page buffer is allocated once at its exact final size and the PDF is
+    base64-encoded chunk by chunk straight into it, so no full-size
+    intermediate base64 bytes or str is created and the buffer never regrows.
+    The title is HTML-escaped here, once; the template split means a literal %
+    is safe.
+    """
+    title_bytes = _escape_html(title).encode()
+    b64_len = 4 * -(-len(pdf_bytes) // 3)
+    html = bytearray(
+        len(_VIEWER_HEAD) + len(title_bytes) + len(_VIEWER_MIDDLE) + b64_len + len(_VIEWER_TAIL)
+    )
 
-    return PDF_VIEWER_TEMPLATE % {
-        "title": title,
-        "pdf_base64": pdf_base64,
-    }
+    offset = 0
+    for part in (_VIEWER_HEAD, title_bytes, _VIEWER_MIDDLE):
+        html[offset : offset + len(part)] = part
+        offset += len(part)
+    view = memoryview(pdf_bytes)
+    for start in range(0, len(view), _B64_CHUNK):
+        encoded = base64.b64encode(view[start : start + _B64_CHUNK])
+        html[offset : offset + len(encoded)] = encoded
+        offset += len(encoded)
+    html[offset:] = _VIEWER_TAIL
+    return html.decode()
 
 
 async def _push_artifact(
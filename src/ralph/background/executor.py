@@ -155,7 +155,9 @@ class BackgroundExecutor:
                     )
                     break
 
-            await self._dolt.record_task_run_for_user(user_id, task.name, datetime.now(UTC))
+            # One timestamp serves both the Dolt record and the result
+            completed_at = datetime.now(UTC)
+            await self._dolt.record_task_run_for_user(user_id, task.name, completed_at)
 
             log.info(
                 "user_run_completed",
@@ -168,7 +170,7 @@ class BackgroundExecutor:
                 user_id=user_id,
                 status=RunStatus.SUCCESS,
                 started_at=started_at,
-                completed_at=datetime.now(UTC),
+                completed_at=completed_at,
                 turns_used=turns_used,
                 proposals_created=0,  # TODO: Track this when edit_memory_block tool exists
             )
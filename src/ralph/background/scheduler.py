@@ -94,18 +94,28 @@ class BackgroundScheduler:
                 )
                 self._last_cron_check[task.name] = now
 
-        for task in self._registry.list_idle_tasks():
-            trigger = task.trigger
-            if not isinstance(trigger, IdleTrigger):
-                continue
-
-            idle_users = await self._dolt.get_users_idle_for(
-                minutes=trigger.idle_minutes,
-                task_name=task.name,
-                cooldown_minutes=trigger.cooldown_minutes,
+        idle_tasks = [
+            (task, trigger)
+            for task in self._registry.list_idle_tasks()
+            if isinstance(trigger := task.trigger, IdleTrigger)
+        ]
+
+        # Each idle task's lookup is an independent Dolt query, so issue them together
+        idle_results = await asyncio.gather(
+            *(
+                self._dolt.get_users_idle_for(
+                    minutes=trigger.idle_minutes,
+                    task_name=task.name,
+                    cooldown_minutes=trigger.cooldown_minutes,
+                )
+                for task, trigger in idle_tasks
             )
+        )
 
-            eligible_users = [u for u in idle_users if u in task.user_ids]
+        for (task, _trigger), idle_users in zip(idle_tasks, idle_results, strict=True):
+            # Set membership keeps the filter linear for large task rosters
+            task_users = set(task.user_ids)
+            eligible_users = [u for u in idle_users if u in task_users]
 
             if eligible_users:
                 log.info(
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -30,6 +31,9 @@ class Settings(BaseSettings):
     # Agent workspace - where the agent operates (can be a shared codebase)
     agent_workspace: str | None = None  # If set, all users share this workspace
 
+    # Tectonic bundle/font cache; point at a persistent volume so restarts don't refetch
+    tectonic_cache_dir: str | None = None
+
     # Dolt database settings
     dolt_host: str = "localhost"
     dolt_port: int = 3307
@@ -43,6 +47,9 @@ class Settings(BaseSettings):
     sync_interval: int = 300  # seconds (default: 5 min)
     sync_to_openwebui: bool = True  # Enable KB sync
     sync_knowledge_prefix: str = "workspace"  # KB naming prefix
+    sync_kb_refresh_interval: int = 60  # seconds between KB cache warmups
+    # Change-detection hash; the local daemon compares sha256, so only switch when it's unused
+    sync_hash_algo: Literal["sha256", "blake3", "xxh3"] = "sha256"
 
     @property
     def dolt_url(self) -> str:
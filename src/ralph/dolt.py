@@ -6,9 +6,11 @@ import json
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import DBAPIError, InterfaceError
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from ralph.background.models import (
@@ -28,6 +30,10 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
 
+class DoltConnectionError(Exception):
+    """The connection to Dolt was lost mid-operation; retrying on a new pool may succeed."""
+
+
 @dataclass
 class MemoryBlock:
     """A memory block record."""
@@ -39,6 +45,11 @@ class MemoryBlock:
     schema_ref: str | None
     updated_at: datetime
 
+    @cached_property
+    def display_title(self) -> str:
+        """Title to show, falling back to the label in title case (computed once)."""
+        return self.title or self.label.replace("_", " ").title()
+
 
 @dataclass
 class VersionInfo:
@@ -98,8 +109,13 @@ class DoltClient:
         """Get a database session."""
         if not self._session_factory:
             raise RuntimeError("DoltClient not connected. Call connect() first.")
-        async with self._session_factory() as sess:
-            yield sess
+        try:
+            async with self._session_factory() as sess:
+                yield sess
+        except DBAPIError as e:
+            if e.connection_invalidated or isinstance(e, InterfaceError):
+                raise DoltConnectionError(str(e)) from e
+            raise
 
     async def list_blocks(self, user_id: str) -> list[MemoryBlock]:
         """List all memory blocks for a user."""
@@ -145,6 +161,38 @@ class DoltClient:
                 updated_at=row.updated_at,
             )
 
+    async def get_blocks(
+        self, user_id: str, labels: list[str] | None = None
+    ) -> dict[str, MemoryBlock]:
+        """Get several memory blocks in one query, keyed by label (all blocks if labels is None)."""
+        query = (
+            "SELECT user_id, label, title, body, schema_ref, updated_at "
+            "FROM memory_blocks WHERE user_id = :user_id"
+        )
+        params: dict[str, Any] = {"user_id": user_id}
+        if labels is None:
+            stmt = text(query)
+        else:
+            if not labels:
+                return {}
+            stmt = text(query + " AND label IN :labels").bindparams(
+                bindparam("labels", expanding=True)
+            )
+            params["labels"] = labels
+        async with self.session() as session:
+            result = await session.execute(stmt, params)
+            return {
+                row.label: MemoryBlock(
+                    user_id=row.user_id,
+                    label=row.label,
+                    title=row.title,
+                    body=row.body,
+                    schema_ref=row.schema_ref,
+                    updated_at=row.updated_at,
+                )
+                for row in result.fetchall()
+            }
+
     async def update_block(
         self,
         user_id: str,
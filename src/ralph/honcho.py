@@ -114,7 +114,8 @@ class HonchoClient:
 
         try:
             peer = self.client.peer(f"student_{user_id}")
-            response = peer.chat(question)
+            # The SDK call is blocking; keep it off the event loop
+            response = await asyncio.to_thread(peer.chat, question)
 
             if response is None:
                 return None
@@ -105,10 +105,11 @@ async def build_memory_context(
     labels: list[str] | None = None,
 ) -> str:
     """Build memory context string for agent instructions."""
-    blocks = await dolt.list_blocks(user_id)
-
+    # Filter by label in the query rather than fetching every block and scanning
     if labels:
-        blocks = [b for b in blocks if b.label in labels]
+        blocks = list((await dolt.get_blocks(user_id, labels)).values())
+    else:
+        blocks = await dolt.list_blocks(user_id)
 
     if not blocks:
         return ""
@@ -116,7 +117,7 @@ async def build_memory_context(
     sections = ["## Student Memory\n"]
 
     for block in blocks:
-        title = block.title or block.label.replace("_", " ").title()
+        title = block.display_title
         body = block.body or "(empty)"
         sections.append(f"### {title} (label: `{block.label}`)\n\n{body}\n")
 
@@ -46,9 +46,10 @@ from ralph.dolt import close_dolt_client, get_dolt_client
 from ralph.honcho import persist_message_fire_and_forget
 from ralph.memory import build_memory_context, ensure_welcome_blocks
 from ralph.sync.hooks import attach_sync_hooks, capture_event_loop
-from ralph.sync.service import close_sync_client
+from ralph.sync.service import close_sync_client, start_knowledge_refresh
 from ralph.tools import HonchoTools, MemoryBlockTools
 from ralph.tools.hooked_file_tools import HookedFileTools
+from ralph.tools.memory_blocks import close_pooled_client
 
 log = structlog.get_logger()
 
@@ -103,6 +104,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     log.info("ralph_server_starting", model=settings.openrouter_model)
 
     capture_event_loop()
+    start_knowledge_refresh()
 
     dolt = None
     try:
@@ -132,6 +134,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await close_sync_client()
     log.info("sync_client_closed")
 
+    await close_pooled_client()
+    log.info("memory_block_dolt_client_disconnected")
+
     await close_dolt_client()
     log.info("dolt_client_disconnected")
     log.info("ralph_server_stopped")
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import os
 from typing import TYPE_CHECKING
 
 import structlog
@@ -11,7 +13,7 @@ from ralph.sync.service import get_knowledge_service, get_sync_client
 from ralph.sync.workspace_sync import sync_file_to_kb
 
 if TYPE_CHECKING:
-    from collections.abc import Coroutine
+    from collections.abc import Callable, Coroutine
     from pathlib import Path
     from typing import Any
 
@@ -20,8 +22,15 @@ if TYPE_CHECKING:
 
 log = structlog.get_logger()
 
-# Track background tasks to prevent GC
-_background_tasks: set[asyncio.Task[None]] = set()
+# Max syncs running at once; later paths queue so edit storms can't flood OpenWebUI
+MAX_INFLIGHT = 64
+
+# Touched only on the main loop: running syncs by path (also keeps them from being
+# GC'd), paths waiting for a free slot, and paths mutated again while theirs ran.
+# sync_file_to_kb reads the file when it runs, so the latest request per path wins.
+_syncing: dict[Path, asyncio.Task[None]] = {}
+_queued: dict[Path, Callable[[], Coroutine[Any, Any, None]]] = {}
+_stale: dict[Path, Callable[[], Coroutine[Any, Any, None]]] = {}
 
 
 _main_loop: asyncio.AbstractEventLoop | None = None
@@ -33,8 +42,40 @@ def capture_event_loop() -> None:
     _main_loop = asyncio.get_running_loop()
 
 
-def _fire_and_forget(coro: Coroutine[Any, Any, None]) -> None:
-    """Schedule a coroutine as a background task on the main event loop."""
+def _submit(path: Path, sync: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    """Start, queue, or coalesce a sync for path. Runs on the main loop."""
+    if path in _syncing:
+        _stale[path] = sync
+    elif path in _queued or len(_syncing) >= MAX_INFLIGHT:
+        _queued[path] = sync
+    else:
+        _syncing[path] = asyncio.get_running_loop().create_task(_run_sync(path, sync))
+
+
+async def _run_sync(path: Path, sync: Callable[[], Coroutine[Any, Any, None]] | None) -> None:
+    """Sync path until it stops changing, then hand the slot to the next queued path."""
+    try:
+        while sync is not None:
+            try:
+                await sync()
+            except Exception as e:
+                log.warning("sync_hook_failed", path=str(path), error=str(e))
+            sync = _stale.pop(path, None)
+    finally:
+        del _syncing[path]
+        if _queued:
+            next_path = next(iter(_queued))
+            _submit(next_path, _queued.pop(next_path))
+
+
+async def wait_for_syncs() -> None:
+    """Wait until every running and queued sync has finished. Call on the main loop."""
+    while _syncing:
+        await asyncio.gather(*_syncing.values())
+
+
+def schedule_sync(path: Path, sync: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    """Schedule a sync for path as a background task on the main event loop."""
     # Try current thread's loop first, fall back to captured main loop.
     # Agno may run sync tool functions via asyncio.to_thread(), so
     # the post_hook can fire in a thread pool thread with no event loop.
@@ -48,62 +89,65 @@ def _fire_and_forget(coro: Coroutine[Any, Any, None]) -> None:
         log.warning("sync_hook_no_event_loop")
         return
 
-    def _schedule() -> None:
-        task = loop.create_task(coro)  # type: ignore[union-attr]
-        _background_tasks.add(task)
-        task.add_done_callback(_background_tasks.discard)
-
     if loop.is_running():
         # If called from a different thread, use threadsafe scheduling
         try:
             asyncio.get_running_loop()
             # Same thread — schedule directly
-            _schedule()
+            _submit(path, sync)
         except RuntimeError:
             # Different thread — use call_soon_threadsafe
-            loop.call_soon_threadsafe(_schedule)
+            loop.call_soon_threadsafe(_submit, path, sync)
     else:
         log.warning("sync_hook_loop_not_running")
         return
 
 
-def _make_sync_hook(workspace: Path, user_id: str):  # noqa: ANN202
-    """Create a post_hook closure for file mutation tools."""
+def _on_file_mutated(workspace: Path, resolved_ws: str, user_id: str, fc: FunctionCall) -> None:
+    """Post-hook body; workspace context is bound positionally by _make_sync_hook."""
+    log.info("sync_post_hook_called", tool=fc.function.name, error=fc.error, args=fc.arguments)
+
+    # Skip if the tool call failed
+    if fc.error:
+        return
 
-    def _on_file_mutated(fc: FunctionCall) -> None:
-        log.info("sync_post_hook_called", tool=fc.function.name, error=fc.error, args=fc.arguments)
+    # Extract file_name from arguments
+    args = fc.arguments
+    file_name = args.get("file_name") if args else None
+    if not file_name:
+        log.info("sync_hook_no_file_name", args=args)
+        return
 
-        # Skip if the tool call failed
-        if fc.error:
-            return
+    # Resolve full path
+    file_path = (workspace / file_name).resolve()
 
-        # Extract file_name from arguments
-        args = fc.arguments or {}
-        file_name = args.get("file_name")
-        if not file_name:
-            log.info("sync_hook_no_file_name", args=args)
-            return
+    # Safety: ensure it's within workspace
+    if os.path.commonpath([file_path, resolved_ws]) != resolved_ws:
+        log.warning("sync_hook_path_escape", file_name=file_name)
+        return
 
-        # Resolve full path
-        file_path = (workspace / file_name).resolve()
+    # Check sync is configured
+    client = get_sync_client()
+    knowledge = get_knowledge_service()
+    if not client or not knowledge:
+        return
 
-        # Safety: ensure it's within workspace
-        try:
-            file_path.relative_to(workspace.resolve())
-        except ValueError:
-            log.warning("sync_hook_path_escape", file_name=file_name)
-            return
+    log.info("sync_hook_fired", tool=fc.function.name, file=file_name, user_id=user_id)
+    schedule_sync(
+        file_path, functools.partial(sync_file_to_kb, file_path, user_id, client, knowledge)
+    )
 
-        # Check sync is configured
-        client = get_sync_client()
-        knowledge = get_knowledge_service()
-        if not client or not knowledge:
-            return
 
-        log.info("sync_hook_fired", tool=fc.function.name, file=file_name, user_id=user_id)
-        _fire_and_forget(sync_file_to_kb(file_path, user_id, client, knowledge))
+def _make_sync_hook(workspace: Path, user_id: str) -> Callable[[FunctionCall], None]:
+    """
+    Create a post_hook for file mutation tools.
 
-    return _on_file_mutated
+    Agno inspects the hook signature for an ``fc`` parameter; a partial keeps
+    that visible while binding the workspace context.
+    """
+    # Resolve once; the workspace root doesn't move during a session
+    resolved_ws = str(workspace.resolve())
+    return functools.partial(_on_file_mutated, workspace, resolved_ws, user_id)
 
 
 def attach_sync_hooks(file_tools: Toolkit, workspace: Path, user_id: str) -> None:
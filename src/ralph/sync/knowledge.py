@@ -6,6 +6,7 @@ Handles per-user knowledge base creation and mapping.
 
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING
 
 import structlog
@@ -15,6 +16,9 @@ if TYPE_CHECKING:
 
 log = structlog.get_logger()
 
+# How long to remember that a user has no knowledge base (seconds)
+NEGATIVE_CACHE_TTL = 5.0
+
 
 def get_knowledge_name(user_id: str, prefix: str = "workspace") -> str:
     """Generate knowledge base name like "workspace-{user_id}"."""
@@ -32,6 +36,29 @@ class KnowledgeService:
         self.client = openwebui_client
         self.name_prefix = name_prefix
         self._cache: dict[str, str] = {}
+        # user_id -> monotonic deadline until which "no KB" is trusted
+        self._neg_cache: dict[str, float] = {}
+
+    async def get_knowledge_id(self, user_id: str) -> str | None:
+        """Look up the user's KB ID without creating it. Returns None if missing."""
+        if user_id in self._cache:
+            return self._cache[user_id]
+
+        expires_at = self._neg_cache.get(user_id)
+        if expires_at is not None:
+            if time.monotonic() < expires_at:
+                return None
+            del self._neg_cache[user_id]
+
+        name = get_knowledge_name(user_id, self.name_prefix)
+        for kb in await self.client.list_knowledge():
+            if kb.get("name") == name:
+                kb_id: str = kb["id"]
+                self._cache[user_id] = kb_id
+                return kb_id
+
+        self._neg_cache[user_id] = time.monotonic() + NEGATIVE_CACHE_TTL
+        return None
 
     async def get_or_create_knowledge(self, user_id: str) -> str:
         """Get or create knowledge base for user. Returns KB ID."""
@@ -43,6 +70,36 @@ class KnowledgeService:
         kb_id = kb["id"]
 
         self._cache[user_id] = kb_id
+        self._neg_cache.pop(user_id, None)
         log.info("knowledge_base_resolved", user_id=user_id, kb_id=kb_id, name=name)
 
         return kb_id
+
+    async def refresh(self) -> int:
+        """
+        Re-list knowledge bases and rebuild the user -> KB ID cache.
+
+        Entries for KBs that no longer exist are dropped. Returns the number cached.
+        """
+        prefix = f"{self.name_prefix}-"
+        fresh: dict[str, str] = {}
+        for kb in await self.client.list_knowledge():
+            name = kb.get("name") or ""
+            if name.startswith(prefix):
+                fresh[name.removeprefix(prefix)] = kb["id"]
+
+        self._cache = fresh
+        for user_id in fresh.keys() & self._neg_cache.keys():
+            del self._neg_cache[user_id]
+
+        log.debug("knowledge_cache_refreshed", count=len(fresh))
+        return len(fresh)
+
+    def clear_cache(self, user_id: str | None = None) -> None:
+        """Forget cached KB lookups for one user, or for all users."""
+        if user_id is None:
+            self._cache.clear()
+            self._neg_cache.clear()
+            return
+        self._cache.pop(user_id, None)
+        self._neg_cache.pop(user_id, None)
@@ -5,7 +5,10 @@ from __future__ import annotations
 from datetime import datetime  # noqa: TC003 - Pydantic needs runtime access
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+# Content hash algorithms; hashes are stored as "{algo}:{hexdigest}"
+HashAlgo = Literal["sha256", "blake3", "xxh3"]
 
 
 class FileMetadata(BaseModel):
@@ -13,12 +16,17 @@ class FileMetadata(BaseModel):
     Metadata for a synced file.
 
     Matches the format used by openwebui-content-sync for compatibility.
+    Frozen: derive updated copies with model_copy(update=...).
     """
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     path: str
     hash: str
     size: int
     modified: datetime
+    # Raw stat mtime for the scan's change check; None for entries not read from disk
+    mtime_ns: int | None = None
     source: Literal["ralph", "openwebui", "local"] = "ralph"
     openwebui_file_id: str | None = None
     synced_at: datetime | None = None
@@ -31,11 +39,16 @@ class SyncState(BaseModel):
     Stored as JSON in the workspace directory.
     """
 
+    # Not frozen: the sync loop updates knowledge_id/last_sync in place
+    model_config = ConfigDict(extra="ignore")
+
     version: int = 1
     user_id: str
     knowledge_id: str | None = None
     last_sync: datetime | None = None
     files: dict[str, FileMetadata] = Field(default_factory=dict)
+    # "{hash}:{knowledge_id}" -> openwebui_file_id of content already uploaded there
+    hash_cache: dict[str, str] = Field(default_factory=dict)
 
 
 class SyncResult(BaseModel):
@@ -52,6 +65,8 @@ class SyncResult(BaseModel):
 class FileIndexEntry(BaseModel):
     """Lightweight file index entry for API responses."""
 
+    model_config = ConfigDict(extra="ignore", frozen=True, from_attributes=True)
+
     path: str
     hash: str
     size: int
@@ -61,6 +76,12 @@ class FileIndexEntry(BaseModel):
 class WorkspaceIndex(BaseModel):
     """Response model for workspace file listing."""
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     user_id: str
     files: list[FileIndexEntry]
     total_size: int
+
+
+# Reusable validators; building a TypeAdapter per call recompiles the schema
+FILE_INDEX_ADAPTER: TypeAdapter[list[FileIndexEntry]] = TypeAdapter(list[FileIndexEntry])
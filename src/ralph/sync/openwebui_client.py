@@ -6,17 +6,42 @@ Based on patterns from openwebui-content-sync but implemented in Python.
 
 from __future__ import annotations
 
+import asyncio
 import io
-from typing import Any
+from typing import IO, TYPE_CHECKING, Any, Self
 
 import httpx
 import structlog
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Optional orjson - fall back to stdlib json
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+except ImportError:  # pragma: no cover
+    import json
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
 log = structlog.get_logger()
 
 DEFAULT_TIMEOUT = 60.0
 
 HTTP_NO_CONTENT = 204
+HTTP_NOT_MODIFIED = 304
 
 
 class OpenWebUIError(Exception):
@@ -97,52 +122,78 @@ class OpenWebUIClient:
         base_url: str,
         api_key: str,
         timeout: float = DEFAULT_TIMEOUT,
+        transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
-        self._client: httpx.AsyncClient | None = None
-
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                },
-                timeout=self.timeout,
-            )
-        return self._client
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+            },
+            timeout=self.timeout,
+            transport=transport,
+        )
+        # path -> (etag, parsed body) for conditional GETs
+        self._etag_cache: dict[str, tuple[str, Any]] = {}
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Close HTTP client. Later calls raise OpenWebUIError."""
+        await self._client.aclose()
+
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        """The HTTP client, refusing use after close() with our own error type."""
+        if self._client.is_closed:
+            raise OpenWebUIError("OpenWebUI client is closed")
+        return self._client
 
     async def _request(
         self,
         method: str,
         path: str,
+        conditional: bool = False,
         **kwargs: Any,
     ) -> Any:
-        """Make HTTP request and handle errors."""
-        client = await self._get_client()
+        """
+        Make HTTP request and handle errors.
+
+        With conditional=True, the response ETag is remembered and sent back as
+        If-None-Match; a 304 returns the previously parsed body.
+        """
+        if "json" in kwargs:
+            kwargs["content"] = _json_dumps(kwargs.pop("json"))
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
+
+        cached = self._etag_cache.get(path) if conditional else None
+        if cached:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": cached[0]}
 
         try:
-            response = await client.request(method, path, **kwargs)
+            response = await self._http.request(method, path, **kwargs)
+            if cached and response.status_code == HTTP_NOT_MODIFIED:
+                return cached[1]
             response.raise_for_status()
 
             if response.status_code == HTTP_NO_CONTENT or not response.content:
                 return None
 
-            return response.json()
+            data = _json_loads(response.content)
+            if conditional and (etag := response.headers.get("etag")):
+                self._etag_cache[path] = (etag, data)
+            return data
 
         except httpx.HTTPStatusError as e:
             error_detail = ""
             try:
-                error_data = e.response.json()
+                error_data = _json_loads(e.response.content)
                 error_detail = error_data.get("detail", str(error_data))
             except Exception:
                 error_detail = e.response.text[:200] if e.response.text else ""
@@ -164,18 +215,21 @@ class OpenWebUIClient:
             raise OpenWebUIError("Request timed out") from e
 
     async def upload_file(
-        self, filename: str, content: bytes, content_type: str | None = None
+        self, filename: str, content: bytes | IO[bytes], content_type: str | None = None
     ) -> dict[str, Any]:
-        """Upload a file to OpenWebUI. Returns file metadata including 'id'."""
-        client = await self._get_client()
+        """
+        Upload a file to OpenWebUI. Returns file metadata including 'id'.
 
+        content may be bytes or an open binary file, which is streamed.
+        """
         if content_type is None:
             content_type = _guess_content_type(filename)
 
-        files = {"file": (filename, io.BytesIO(content), content_type)}
+        stream = io.BytesIO(content) if isinstance(content, bytes) else content
+        files = {"file": (filename, stream, content_type)}
 
         try:
-            response = await client.post("/api/v1/files/", files=files)
+            response = await self._http.post("/api/v1/files/", files=files)
             response.raise_for_status()
             return response.json()  # type: ignore[no-any-return]
         except httpx.HTTPStatusError as e:
@@ -185,12 +239,41 @@ class OpenWebUIClient:
                 status_code=e.response.status_code,
             ) from e
 
+    async def upload_files_batch(
+        self, items: list[tuple[str, Path]], max_concurrency: int | None = None
+    ) -> list[dict[str, Any] | OpenWebUIError]:
+        """
+        Upload several files concurrently, streaming each from disk.
+
+        items are (filename, path) pairs; at most max_concurrency upload at once
+        (unbounded if None). Returns one entry per item, in order: the file
+        metadata, or the error that upload failed with.
+        """
+        results: list[dict[str, Any] | OpenWebUIError] = [
+            OpenWebUIError("Upload not attempted")
+        ] * len(items)
+        sem = asyncio.Semaphore(max_concurrency or len(items) or 1)
+
+        async def _upload(index: int, filename: str, path: Path) -> None:
+            try:
+                async with sem:
+                    with path.open("rb") as f:
+                        results[index] = await self.upload_file(filename, f)
+            except OpenWebUIError as e:
+                results[index] = e
+            except (OSError, httpx.HTTPError) as e:
+                results[index] = OpenWebUIError(f"File upload failed: {e}")
+
+        async with asyncio.TaskGroup() as tg:
+            for index, (filename, path) in enumerate(items):
+                tg.create_task(_upload(index, filename, path))
+
+        return results
+
     async def get_file_content(self, file_id: str) -> bytes:
         """Download file content by ID."""
-        client = await self._get_client()
-
         try:
-            response = await client.get(f"/api/v1/files/{file_id}/content")
+            response = await self._http.get(f"/api/v1/files/{file_id}/content")
             response.raise_for_status()
             return response.content
         except httpx.HTTPStatusError as e:
@@ -205,7 +288,7 @@ class OpenWebUIClient:
 
     async def list_knowledge(self) -> list[dict[str, Any]]:
         """List all knowledge bases."""
-        result = await self._request("GET", "/api/v1/knowledge/")
+        result = await self._request("GET", "/api/v1/knowledge/", conditional=True)
         # OpenWebUI wraps the list in {"items": [...]}
         if isinstance(result, dict) and "items" in result:
             return result["items"]  # type: ignore[no-any-return]
@@ -231,7 +314,7 @@ class OpenWebUIClient:
 
     async def get_knowledge_files(self, knowledge_id: str) -> list[dict[str, Any]]:
         """Get files in a knowledge base."""
-        kb = await self._request("GET", f"/api/v1/knowledge/{knowledge_id}")
+        kb = await self._request("GET", f"/api/v1/knowledge/{knowledge_id}", conditional=True)
         # Files are nested under 'files' key (can be None)
         return kb.get("files") or []  # type: ignore[no-any-return]
 
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+
 import structlog
 
 from ralph.config import get_settings
@@ -10,46 +14,76 @@ from ralph.sync.openwebui_client import OpenWebUIClient
 
 log = structlog.get_logger()
 
-_client: OpenWebUIClient | None = None
-_knowledge: KnowledgeService | None = None
+_refresh_task: asyncio.Task[None] | None = None
 
 
-def get_sync_client() -> OpenWebUIClient | None:
-    """Get or create process-level OpenWebUI client."""
-    global _client
+@functools.cache
+def _sync_services() -> tuple[OpenWebUIClient, KnowledgeService] | None:
+    """Build the process-level client and knowledge service once, or None if disabled."""
     settings = get_settings()
     if not settings.openwebui_url or not settings.openwebui_api_key:
         return None
     if not settings.sync_to_openwebui:
         return None
-    if _client is None:
-        _client = OpenWebUIClient(
-            base_url=settings.openwebui_url,
-            api_key=settings.openwebui_api_key,
-        )
-        log.info("sync_client_created", base_url=settings.openwebui_url)
-    return _client
+
+    client = OpenWebUIClient(
+        base_url=settings.openwebui_url,
+        api_key=settings.openwebui_api_key,
+    )
+    knowledge = KnowledgeService(
+        openwebui_client=client,
+        name_prefix=settings.sync_knowledge_prefix,
+    )
+    log.info("sync_client_created", base_url=settings.openwebui_url)
+    return client, knowledge
+
+
+def get_sync_client() -> OpenWebUIClient | None:
+    """Get or create process-level OpenWebUI client."""
+    services = _sync_services()
+    return services[0] if services else None
 
 
 def get_knowledge_service() -> KnowledgeService | None:
     """Get or create process-level knowledge service."""
-    global _knowledge
-    client = get_sync_client()
-    if client is None:
-        return None
-    if _knowledge is None:
-        settings = get_settings()
-        _knowledge = KnowledgeService(
-            openwebui_client=client,
-            name_prefix=settings.sync_knowledge_prefix,
-        )
-    return _knowledge
+    services = _sync_services()
+    return services[1] if services else None
+
+
+async def _refresh_knowledge_loop(knowledge: KnowledgeService, interval: int) -> None:
+    """Keep the KB cache warm so hooks rarely need to list knowledge bases."""
+    while True:
+        try:
+            await knowledge.refresh()
+        except Exception as e:
+            log.warning("knowledge_refresh_failed", error=str(e))
+        await asyncio.sleep(interval)
+
+
+def start_knowledge_refresh() -> None:
+    """Start periodic KB cache warmup. Call from async context during setup."""
+    global _refresh_task
+    if _refresh_task is not None:
+        return
+    knowledge = get_knowledge_service()
+    if knowledge is None:
+        return
+    interval = get_settings().sync_kb_refresh_interval
+    _refresh_task = asyncio.create_task(_refresh_knowledge_loop(knowledge, interval))
+    log.info("knowledge_refresh_started", interval=interval)
 
 
 async def close_sync_client() -> None:
     """Close the singleton client. Call on shutdown."""
-    global _client, _knowledge
-    if _client:
-        await _client.close()
-        _client = None
-    _knowledge = None
+    global _refresh_task
+    if _refresh_task:
+        _refresh_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _refresh_task
+        _refresh_task = None
+    # Only close what was built; calling _sync_services() here would construct it
+    if _sync_services.cache_info().currsize:
+        services = _sync_services()
+        if services:
+            await services[0].close()
+    _sync_services.cache_clear()
@@ -2,22 +2,51 @@
 Workspace sync service with file indexing.
 
 Handles synchronization between Ralph workspace and OpenWebUI knowledge base.
-Uses SHA256 hashing for change detection (same approach as openwebui-content-sync).
+Uses SHA256 hashing for change detection (same approach as openwebui-content-sync);
+blake3 or xxh3 can be chosen when the fast-hash extra is installed.
 """
 
 from __future__ import annotations
 
+import asyncio
+import fnmatch
+import functools
 import hashlib
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import aiofiles
 import structlog
 
-from ralph.sync.models import FileIndexEntry, FileMetadata, SyncResult, SyncState
+from ralph.sync.models import (
+    FILE_INDEX_ADAPTER,
+    FileIndexEntry,
+    FileMetadata,
+    HashAlgo,
+    SyncResult,
+    SyncState,
+)
+
+# Optional fast hashers - sha256 is used when they're missing
+try:
+    import blake3
+except ImportError:  # pragma: no cover
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover
+    xxhash = None
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from ralph.sync.knowledge import KnowledgeService
     from ralph.sync.openwebui_client import OpenWebUIClient
 
@@ -25,6 +54,19 @@ log = structlog.get_logger()
 
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+# Max files hashed concurrently during a scan
+SCAN_CONCURRENCY = 32
+
+# Read size when streaming a file through the hasher
+HASH_CHUNK_SIZE = 128 * 1024
+
+# Max OpenWebUI requests in flight during sync_to_openwebui
+SYNC_CONCURRENCY = 8
+
+# Files below SMALL_FILE_SIZE are hashed in groups of HASH_BATCH_SIZE per thread
+SMALL_FILE_SIZE = 64 * 1024
+HASH_BATCH_SIZE = 16
+
 DEFAULT_IGNORE_PATTERNS = {
     ".git",
     ".DS_Store",
@@ -37,28 +79,169 @@ DEFAULT_IGNORE_PATTERNS = {
     "*.tmp",
     "*.swp",
     ".sync_state.json",
+    ".latex_cache",
 }
 
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+# Per-thread read buffer for hash_file, reused across files
+_hash_buffers = threading.local()
+
+
+def resolve_hash_algo(algo: HashAlgo) -> HashAlgo:
+    """Return algo if its package is installed, else fall back to sha256."""
+    if (algo == "blake3" and blake3 is None) or (algo == "xxh3" and xxhash is None):
+        log.warning("hash_algo_unavailable", algo=algo, fallback="sha256")
+        return "sha256"
+    return algo
+
+
+def _new_hasher(algo: HashAlgo) -> Any:
+    """Create an incremental hasher; all of them expose update() and hexdigest()."""
+    if algo == "blake3":
+        return blake3.blake3()  # type: ignore[union-attr]
+    if algo == "xxh3":
+        return xxhash.xxh3_128()  # type: ignore[union-attr]
+    return hashlib.sha256()
+
+
+def compute_hash(content: bytes, algo: HashAlgo = "sha256") -> str:
+    """Compute the content hash with an "{algo}:" prefix."""
+    hasher = _new_hasher(algo)
+    hasher.update(content)
+    return f"{algo}:{hasher.hexdigest()}"
+
+
+def hash_file(path: str | os.PathLike[str], algo: HashAlgo = "sha256") -> str:
+    """
+    Compute the hash of a file with prefix, streaming it from disk.
+
+    Reads into a per-thread buffer, so memory stays at HASH_CHUNK_SIZE per
+    worker regardless of file size. Blocking; call via asyncio.to_thread.
+    """
+    view = getattr(_hash_buffers, "view", None)
+    if view is None:
+        view = _hash_buffers.view = memoryview(bytearray(HASH_CHUNK_SIZE))
+
+    hasher = _new_hasher(algo)
+    with open(path, "rb", buffering=0) as f:  # noqa: PTH123
+        while n := f.readinto(view):
+            hasher.update(view[:n])
+    return f"{algo}:{hasher.hexdigest()}"
+
+
+def _hash_batch(paths: list[str], algo: HashAlgo) -> list[str | OSError]:
+    """Hash several files in one call; unreadable files yield their OSError."""
+    results: list[str | OSError] = []
+    for path in paths:
+        try:
+            results.append(hash_file(path, algo))
+        except OSError as e:
+            results.append(e)
+    return results
 
-def compute_hash(content: bytes) -> str:
-    """Compute SHA256 hash of content with prefix."""
-    digest = hashlib.sha256(content).hexdigest()
-    return f"sha256:{digest}"
 
+def _mtime_to_datetime(mtime_ns: int) -> datetime:
+    """Convert a stat mtime in nanoseconds to an aware UTC datetime."""
+    return datetime.fromtimestamp(mtime_ns / 1e9, tz=UTC)
 
-def should_ignore(path: Path, ignore_patterns: set[str]) -> bool:
-    """Check if a path should be ignored based on patterns."""
-    name = path.name
-    for pattern in ignore_patterns:
-        if pattern.startswith("*"):
-            if name.endswith(pattern[1:]):
-                return True
-        elif name == pattern:
+
+def _hash_cache_key(file_hash: str, knowledge_id: str) -> str:
+    """Key for SyncState.hash_cache."""
+    return f"{file_hash}:{knowledge_id}"
+
+
+def _write_and_hash(path: Path, content: bytes, algo: HashAlgo) -> tuple[str, int]:
+    """
+    Write content in chunks, hashing each chunk as it is written.
+
+    Returns the prefixed hash and the file's resulting mtime_ns. Blocking.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    hasher = _new_hasher(algo)
+    view = memoryview(content)
+    with path.open("wb") as f:
+        for start in range(0, len(view), HASH_CHUNK_SIZE):
+            chunk = view[start : start + HASH_CHUNK_SIZE]
+            f.write(chunk)
+            hasher.update(chunk)
+        f.flush()
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+    return f"{algo}:{hasher.hexdigest()}", mtime_ns
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    """Write via a temp file and rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temp name per write, so concurrent saves never share a temp file
+    tmp = tempfile.NamedTemporaryFile(  # noqa: SIM115
+        "w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)  # noqa: PTH105
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+
+
+def _walk_files(
+    root: str, rules: IgnoreRules | None = None
+) -> Iterator[tuple[str, os.stat_result]]:
+    """
+    Yield (path, stat) for every file under root via os.scandir.
+
+    DirEntry caches the type and stat results from the directory read, so each
+    file costs at most one stat call. Symlinked directories are not followed.
+    Entries matching rules are skipped, and ignored directories are never entered.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if rules is not None and rules.matches(entry.name):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk_files(entry.path, rules)
+                elif entry.is_file():
+                    yield entry.path, entry.stat()
+    except OSError as e:
+        log.warning("workspace_dir_unreadable", path=root, error=str(e))
+
+
+@dataclass(frozen=True, slots=True)
+class IgnoreRules:
+    """Ignore patterns split by how cheaply they can be matched."""
+
+    exact: frozenset[str]
+    suffixes: tuple[str, ...]
+    pattern: re.Pattern[str] | None
+
+    def matches(self, name: str) -> bool:
+        """Check a single path component against the rules."""
+        if name in self.exact or name.endswith(self.suffixes):
             return True
-        for parent in path.parents:
-            if parent.name in ignore_patterns:
-                return True
-    return False
+        return self.pattern is not None and self.pattern.match(name) is not None
+
+
+def compile_ignore_patterns(patterns: Iterable[str]) -> IgnoreRules:
+    """Precompile glob patterns: literals, "*.ext" suffixes, and one regex for the rest."""
+    exact: set[str] = set()
+    suffixes: list[str] = []
+    globs: list[str] = []
+    for pattern in patterns:
+        if not _GLOB_CHARS.search(pattern):
+            exact.add(pattern)
+        elif pattern.startswith("*") and not _GLOB_CHARS.search(pattern[1:]):
+            suffixes.append(pattern[1:])
+        else:
+            globs.append(fnmatch.translate(pattern))
+
+    return IgnoreRules(
+        exact=frozenset(exact),
+        suffixes=tuple(suffixes),
+        pattern=re.compile("|".join(globs)) if globs else None,
+    )
 
 
 async def sync_file_to_kb(
@@ -73,11 +256,9 @@ async def sync_file_to_kb(
     If the file exists on disk, uploads it (replacing any previous version).
     If the file doesn't exist, removes it from the KB.
     """
-    kb_id = await knowledge_service.get_or_create_knowledge(user_id)
-
     if file_path.exists() and file_path.is_file():
-        content = file_path.read_bytes()
-        file_hash = compute_hash(content)
+        kb_id = await knowledge_service.get_or_create_knowledge(user_id)
+        file_hash = await asyncio.to_thread(hash_file, file_path)
 
         kb_files = await openwebui_client.get_knowledge_files(kb_id)
         for existing in kb_files:
@@ -87,10 +268,8 @@ async def sync_file_to_kb(
                 await openwebui_client.delete_file(existing["id"])
                 break
 
-        file_info = await openwebui_client.upload_file(
-            filename=file_path.name,
-            content=content,
-        )
+        with file_path.open("rb") as f:
+            file_info = await openwebui_client.upload_file(filename=file_path.name, content=f)
         await openwebui_client.add_file_to_knowledge(kb_id, file_info["id"])
 
         log.info(
@@ -101,6 +280,11 @@ async def sync_file_to_kb(
             kb_id=kb_id,
         )
     else:
+        # Nothing to remove if the user has no KB yet; don't create one just to delete
+        kb_id = await knowledge_service.get_knowledge_id(user_id)
+        if kb_id is None:
+            return
+
         kb_files = await openwebui_client.get_knowledge_files(kb_id)
         for existing in kb_files:
             existing_name = existing.get("meta", {}).get("name", existing.get("filename", ""))
@@ -125,13 +309,38 @@ class WorkspaceSync:
         user_id: str,
         openwebui_client: OpenWebUIClient | None = None,
         ignore_patterns: set[str] | None = None,
+        hash_algo: HashAlgo = "sha256",
     ) -> None:
         self.workspace_path = workspace_path
         self.user_id = user_id
         self.openwebui_client = openwebui_client
         self.ignore_patterns = ignore_patterns or DEFAULT_IGNORE_PATTERNS
+        self.hash_algo: HashAlgo = resolve_hash_algo(hash_algo)
+        self._ignore_rules = compile_ignore_patterns(self.ignore_patterns)
         self._state: SyncState | None = None
 
+    @functools.cached_property
+    def _root(self) -> str:
+        """Workspace path with symlinks resolved, computed once."""
+        return os.path.realpath(self.workspace_path)
+
+    def _safe_join(self, rel_path: str) -> Path:
+        """
+        Join rel_path onto the workspace root.
+
+        Raises ValueError if the path escapes the workspace, lexically or via a symlink.
+        """
+        normed = os.path.normpath(rel_path)
+        if os.path.isabs(normed) or normed.partition(os.sep)[0] == os.pardir:  # noqa: PTH117
+            raise ValueError(f"Path escapes workspace: {rel_path}")
+
+        full_path = os.path.join(self._root, normed)  # noqa: PTH118
+        # Symlinks inside the workspace can still point outside it
+        if os.path.commonpath([os.path.realpath(full_path), self._root]) != self._root:
+            raise ValueError(f"Path escapes workspace: {rel_path}")
+
+        return Path(full_path)
+
     @property
     def state_path(self) -> Path:
         """Path to sync state file."""
@@ -142,15 +351,13 @@ class WorkspaceSync:
         if self._state is not None:
             return self._state
 
-        if self.state_path.exists():
-            try:
-                async with aiofiles.open(self.state_path) as f:
-                    data = await f.read()
-                    self._state = SyncState.model_validate_json(data)
-            except Exception as e:
-                log.warning("sync_state_load_failed", error=str(e), path=str(self.state_path))
-                self._state = SyncState(user_id=self.user_id)
-        else:
+        try:
+            data = await asyncio.to_thread(self.state_path.read_bytes)
+            self._state = SyncState.model_validate_json(data)
+        except FileNotFoundError:
+            self._state = SyncState(user_id=self.user_id)
+        except Exception as e:
+            log.warning("sync_state_load_failed", error=str(e), path=str(self.state_path))
             self._state = SyncState(user_id=self.user_id)
 
         return self._state
@@ -160,52 +367,94 @@ class WorkspaceSync:
         if self._state is None:
             return
 
-        self.workspace_path.mkdir(parents=True, exist_ok=True)
-        async with aiofiles.open(self.state_path, "w") as f:
-            await f.write(self._state.model_dump_json(indent=2))
+        await asyncio.to_thread(_write_atomic, self.state_path, self._state.model_dump_json())
 
-    async def scan_workspace(self) -> dict[str, FileMetadata]:
-        """Scan workspace and compute file hashes."""
-        files: dict[str, FileMetadata] = {}
+    async def scan_workspace(self, force_rehash: bool = False) -> dict[str, FileMetadata]:
+        """
+        Scan workspace and compute file hashes.
 
+        Files whose size and mtime_ns match the loaded state reuse the stored hash
+        without being opened, unless it was made with a different algorithm.
+        Pass force_rehash=True to hash everything.
+        """
         if not self.workspace_path.exists():
-            return files
+            return {}
 
-        for file_path in self.workspace_path.rglob("*"):
-            if not file_path.is_file():
-                continue
+        known = self._state.files if self._state and not force_rehash else {}
+        hash_prefix = f"{self.hash_algo}:"
 
-            rel_path = file_path.relative_to(self.workspace_path)
+        # Entries below are built from our own stat/hash results, so they skip
+        # validation; pydantic still validates state loaded from JSON.
 
-            if should_ignore(rel_path, self.ignore_patterns):
-                continue
+        root = os.fspath(self.workspace_path)
+        root_len = len(root) + len(os.sep)
+        # Ignore rules are applied during the walk, pruning whole ignored directories
+        candidates = await asyncio.to_thread(lambda: list(_walk_files(root, self._ignore_rules)))
+
+        files: dict[str, FileMetadata] = {}
+        to_hash: list[tuple[str, str, int, int]] = []
+        for full_path, stat in candidates:
+            rel_path = full_path[root_len:]
 
-            stat = file_path.stat()
             if stat.st_size > MAX_FILE_SIZE:
                 log.warning(
                     "file_too_large",
-                    path=str(rel_path),
+                    path=rel_path,
                     size=stat.st_size,
                     max_size=MAX_FILE_SIZE,
                 )
                 continue
 
-            try:
-                async with aiofiles.open(file_path, "rb") as f:
-                    content = await f.read()
-                    file_hash = compute_hash(content)
-            except OSError as e:
-                log.warning("file_read_failed", path=str(rel_path), error=str(e))
-                continue
+            mtime_ns = stat.st_mtime_ns
+            existing = known.get(rel_path)
+            if (
+                existing
+                and existing.size == stat.st_size
+                and existing.hash.startswith(hash_prefix)
+                and (
+                    existing.mtime_ns == mtime_ns
+                    if existing.mtime_ns is not None
+                    else existing.modified == _mtime_to_datetime(mtime_ns)
+                )
+            ):
+                files[rel_path] = FileMetadata.model_construct(
+                    path=rel_path,
+                    hash=existing.hash,
+                    size=stat.st_size,
+                    modified=existing.modified,
+                    mtime_ns=mtime_ns,
+                    source="ralph",
+                )
+            else:
+                to_hash.append((full_path, rel_path, stat.st_size, mtime_ns))
 
-            files[str(rel_path)] = FileMetadata(
-                path=str(rel_path),
-                hash=file_hash,
-                size=stat.st_size,
-                modified=datetime.fromtimestamp(stat.st_mtime, tz=UTC),
-                source="ralph",
-            )
+        # Small files are hashed several per thread hop, since the hop costs more than the hash
+        small = [item for item in to_hash if item[2] < SMALL_FILE_SIZE]
+        batches = [small[i : i + HASH_BATCH_SIZE] for i in range(0, len(small), HASH_BATCH_SIZE)]
+        batches.extend([item] for item in to_hash if item[2] >= SMALL_FILE_SIZE)
+
+        # Bound concurrent hashes so a large workspace doesn't exhaust the thread pool
+        sem = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+        async def _hash(batch: list[tuple[str, str, int, int]]) -> None:
+            async with sem:
+                hashes = await asyncio.to_thread(
+                    _hash_batch, [item[0] for item in batch], self.hash_algo
+                )
+            for (_, rel_path, size, mtime_ns), file_hash in zip(batch, hashes, strict=True):
+                if isinstance(file_hash, OSError):
+                    log.warning("file_read_failed", path=rel_path, error=str(file_hash))
+                    continue
+                files[rel_path] = FileMetadata.model_construct(
+                    path=rel_path,
+                    hash=file_hash,
+                    size=size,
+                    modified=_mtime_to_datetime(mtime_ns),
+                    mtime_ns=mtime_ns,
+                    source="ralph",
+                )
 
+        await asyncio.gather(*(_hash(batch) for batch in batches))
         return files
 
     def get_file_index(self) -> list[FileIndexEntry]:
@@ -213,27 +462,25 @@ class WorkspaceSync:
         if self._state is None:
             return []
 
-        return [
-            FileIndexEntry(
-                path=meta.path,
-                hash=meta.hash,
-                size=meta.size,
-                modified=meta.modified,
-            )
-            for meta in self._state.files.values()
-        ]
+        return FILE_INDEX_ADAPTER.validate_python(
+            list(self._state.files.values()), from_attributes=True
+        )
 
-    async def refresh_index(self) -> list[FileIndexEntry]:
+    async def refresh_index(self, force_rehash: bool = False) -> list[FileIndexEntry]:
         """Scan workspace and update index. Returns current index."""
         state = await self.load_state()
-        current_files = await self.scan_workspace()
+        current_files = await self.scan_workspace(force_rehash=force_rehash)
 
         # Preserve openwebui_file_id for files that haven't changed
         for path, meta in current_files.items():
             existing = state.files.get(path)
             if existing and existing.hash == meta.hash:
-                meta.openwebui_file_id = existing.openwebui_file_id
-                meta.synced_at = existing.synced_at
+                meta = meta.model_copy(  # noqa: PLW2901
+                    update={
+                        "openwebui_file_id": existing.openwebui_file_id,
+                        "synced_at": existing.synced_at,
+                    }
+                )
             state.files[path] = meta
 
         for path in list(state.files.keys()):
@@ -249,11 +496,7 @@ class WorkspaceSync:
 
         Raises FileNotFoundError or ValueError if path escapes workspace.
         """
-        full_path = self.workspace_path / rel_path
-        try:
-            full_path.resolve().relative_to(self.workspace_path.resolve())
-        except ValueError as e:
-            raise ValueError(f"Path escapes workspace: {rel_path}") from e
+        full_path = self._safe_join(rel_path)
 
         if not full_path.exists():
             raise FileNotFoundError(f"File not found: {rel_path}")
@@ -273,26 +516,19 @@ class WorkspaceSync:
         if len(content) > MAX_FILE_SIZE:
             raise ValueError(f"File too large: {len(content)} bytes (max {MAX_FILE_SIZE})")
 
-        full_path = self.workspace_path / rel_path
-        try:
-            full_path.resolve().relative_to(self.workspace_path.resolve())
-        except ValueError as e:
-            raise ValueError(f"Path escapes workspace: {rel_path}") from e
-
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path = self._safe_join(rel_path)
 
-        async with aiofiles.open(full_path, "wb") as f:
-            await f.write(content)
+        file_hash, mtime_ns = await asyncio.to_thread(
+            _write_and_hash, full_path, content, self.hash_algo
+        )
 
         state = await self.load_state()
-        file_hash = compute_hash(content)
-        now = datetime.now(UTC)
-
         metadata = FileMetadata(
             path=rel_path,
             hash=file_hash,
             size=len(content),
-            modified=now,
+            modified=_mtime_to_datetime(mtime_ns),
+            mtime_ns=mtime_ns,
             source="ralph",
         )
         state.files[rel_path] = metadata
@@ -302,11 +538,7 @@ class WorkspaceSync:
 
     async def delete_file(self, rel_path: str) -> bool:
         """Delete file from workspace. Raises ValueError if path escapes workspace."""
-        full_path = self.workspace_path / rel_path
-        try:
-            full_path.resolve().relative_to(self.workspace_path.resolve())
-        except ValueError as e:
-            raise ValueError(f"Path escapes workspace: {rel_path}") from e
+        full_path = self._safe_join(rel_path)
 
         if not full_path.exists():
             return False
@@ -320,8 +552,15 @@ class WorkspaceSync:
 
         return True
 
-    async def sync_to_openwebui(self) -> SyncResult:
-        """Sync workspace files to OpenWebUI knowledge base."""
+    async def sync_to_openwebui(
+        self, current_files: dict[str, FileMetadata] | None = None
+    ) -> SyncResult:
+        """
+        Sync workspace files to OpenWebUI knowledge base.
+
+        Callers that have just scanned may pass the scan_workspace result as
+        current_files to skip rescanning; otherwise the workspace is scanned here.
+        """
         if self.openwebui_client is None:
             return SyncResult(success=False, errors=["OpenWebUI client not configured"])
 
@@ -330,7 +569,8 @@ class WorkspaceSync:
 
         try:
             state = await self.load_state()
-            current_files = await self.scan_workspace()
+            if current_files is None:
+                current_files = await self.scan_workspace()
 
             if not state.knowledge_id:
                 kb = await self.openwebui_client.get_or_create_knowledge(
@@ -338,7 +578,33 @@ class WorkspaceSync:
                 )
                 state.knowledge_id = kb["id"]
 
-            for path, meta in current_files.items():
+            kb_id: str = state.knowledge_id  # type: ignore[assignment]
+
+            # Bound concurrent OpenWebUI calls. State is only mutated between awaits,
+            # so the concurrent steps below don't need a lock on the event loop.
+            sem = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+            # Ids actually in the KB, listed at most once per sync and only if a
+            # hash_cache hit needs checking: files can be deleted remotely behind our back
+            remote_ids: set[str] | None = None
+            remote_ids_lock = asyncio.Lock()
+
+            async def _remote_file_ids() -> set[str]:
+                nonlocal remote_ids
+                async with remote_ids_lock:
+                    if remote_ids is None:
+                        async with sem:
+                            kb_files = await self.openwebui_client.get_knowledge_files(kb_id)  # type: ignore[union-attr]
+                        remote_ids = {f["id"] for f in kb_files}
+                return remote_ids
+
+            def _restore(path: str, previous: FileMetadata | None) -> None:
+                if previous is None:
+                    state.files.pop(path, None)
+                else:
+                    state.files[path] = previous
+
+            async def _prepare(path: str, meta: FileMetadata) -> tuple[str, FileMetadata] | None:
                 existing = state.files.get(path)
 
                 if (
@@ -347,43 +613,118 @@ class WorkspaceSync:
                     and existing.openwebui_file_id
                     and existing.synced_at
                 ):
-                    continue
+                    return None
 
-                try:
-                    content = await self.read_file(path)
-
-                    if existing and existing.openwebui_file_id:
-                        await self.openwebui_client.delete_file(existing.openwebui_file_id)
-
-                    file_info = await self.openwebui_client.upload_file(
-                        filename=Path(path).name,
-                        content=content,
+                if existing and existing.openwebui_file_id:
+                    try:
+                        async with sem:
+                            await self._release_remote_file(state, existing.openwebui_file_id, path)
+                    except Exception as e:
+                        log.error("sync_file_failed", path=path, error=str(e))
+                        result.errors.append(f"{path}: {e}")
+                        return None
+                    state.files[path] = existing.model_copy(update={"openwebui_file_id": None})
+
+                # Same content already in this KB (e.g. a renamed file): reuse it if still there
+                cache_key = _hash_cache_key(meta.hash, kb_id)
+                cached_id = state.hash_cache.get(cache_key)
+                if cached_id:
+                    # Claim the id before awaiting, so a concurrent release sees it shared
+                    previous = state.files.get(path)
+                    state.files[path] = meta.model_copy(
+                        update={"openwebui_file_id": cached_id, "synced_at": datetime.now(UTC)}
                     )
+                    try:
+                        if cached_id in await _remote_file_ids():
+                            return None
+                    except Exception as e:
+                        log.error("sync_file_failed", path=path, error=str(e))
+                        result.errors.append(f"{path}: {e}")
+                        _restore(path, previous)
+                        return None
+                    _restore(path, previous)
+                    state.hash_cache.pop(cache_key, None)
+
+                return path, meta
+
+            async def _attach(
+                path: str, meta: FileMetadata, file_info: dict[str, Any] | Exception
+            ) -> None:
+                if isinstance(file_info, Exception):
+                    log.error("sync_file_failed", path=path, error=str(file_info))
+                    result.errors.append(f"{path}: {file_info}")
+                    return
+
+                try:
                     file_id = file_info["id"]
+                    async with sem:
+                        await self.openwebui_client.add_file_to_knowledge(  # type: ignore[union-attr]
+                            kb_id, file_id
+                        )
 
-                    await self.openwebui_client.add_file_to_knowledge(
-                        state.knowledge_id,  # type: ignore[arg-type]
-                        file_id,
+                    state.files[path] = meta.model_copy(
+                        update={"openwebui_file_id": file_id, "synced_at": datetime.now(UTC)}
                     )
-
-                    meta.openwebui_file_id = file_id
-                    meta.synced_at = datetime.now(UTC)
-                    state.files[path] = meta
+                    state.hash_cache[_hash_cache_key(meta.hash, kb_id)] = file_id
                     result.files_uploaded += 1
 
                 except Exception as e:
                     log.error("sync_file_failed", path=path, error=str(e))
                     result.errors.append(f"{path}: {e}")
 
-            for path, meta in list(state.files.items()):
-                if path not in current_files and meta.openwebui_file_id:
+            async def _remove(path: str, meta: FileMetadata) -> None:
+                try:
+                    async with sem:
+                        await self._release_remote_file(
+                            state,
+                            meta.openwebui_file_id,  # type: ignore[arg-type]
+                            path,
+                        )
+                    del state.files[path]
+                    result.files_deleted += 1
+                except Exception as e:
+                    log.error("delete_file_failed", path=path, error=str(e))
+                    result.errors.append(f"delete {path}: {e}")
+
+            prepared = await asyncio.gather(
+                *(_prepare(path, meta) for path, meta in current_files.items())
+            )
+
+            def _contain(
+                items: list[tuple[str, FileMetadata]],
+            ) -> list[tuple[str, FileMetadata, Path]]:
+                contained: list[tuple[str, FileMetadata, Path]] = []
+                for path, meta in items:
                     try:
-                        await self.openwebui_client.delete_file(meta.openwebui_file_id)
-                        del state.files[path]
-                        result.files_deleted += 1
-                    except Exception as e:
-                        log.error("delete_file_failed", path=path, error=str(e))
-                        result.errors.append(f"delete {path}: {e}")
+                        contained.append((path, meta, self._safe_join(path)))
+                    except ValueError as e:
+                        log.error("sync_file_failed", path=path, error=str(e))
+                        result.errors.append(f"{path}: {e}")
+                return contained
+
+            # The scan follows symlinked files, so refuse any that resolve outside
+            pending = await asyncio.to_thread(
+                _contain, [item for item in prepared if item is not None]
+            )
+
+            uploads = await self.openwebui_client.upload_files_batch(
+                [(Path(path).name, full_path) for path, _, full_path in pending],
+                max_concurrency=SYNC_CONCURRENCY,
+            )
+            await asyncio.gather(
+                *(
+                    _attach(path, meta, file_info)
+                    for (path, meta, _), file_info in zip(pending, uploads, strict=True)
+                )
+            )
+
+            await asyncio.gather(
+                *(
+                    _remove(path, meta)
+                    for path, meta in list(state.files.items())
+                    if path not in current_files and meta.openwebui_file_id
+                )
+            )
 
             state.last_sync = datetime.now(UTC)
             await self.save_state()
@@ -398,6 +739,18 @@ class WorkspaceSync:
 
         return result
 
+    async def _release_remote_file(self, state: SyncState, file_id: str, path: str) -> None:
+        """Delete a remote file that path no longer uses, unless another path still shares it."""
+        if any(
+            other_path != path and meta.openwebui_file_id == file_id
+            for other_path, meta in state.files.items()
+        ):
+            return
+
+        # Evict before awaiting, so concurrent syncs can't reuse an id mid-delete
+        state.hash_cache = {k: v for k, v in state.hash_cache.items() if v != file_id}
+        await self.openwebui_client.delete_file(file_id)  # type: ignore[union-attr]
+
     async def sync_from_openwebui(self) -> SyncResult:
         """Sync files from OpenWebUI knowledge base to workspace."""
         if self.openwebui_client is None:
@@ -431,7 +784,7 @@ class WorkspaceSync:
 
                 try:
                     content = await self.openwebui_client.get_file_content(file_id)
-                    new_hash = compute_hash(content)
+                    new_hash = compute_hash(content, self.hash_algo)
 
                     existing = state.files.get(target_path)
                     if existing and existing.hash == new_hash:
@@ -0,0 +1,52 @@
+"""Long-lived event loops for running async work from sync tool calls."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    from typing import Any
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """
+    An event loop on a daemon thread, started on first use.
+
+    Agno runs sync tool methods outside the server's loop. Tools hand their
+    async work to one of these instead of creating a loop per call, so clients
+    and timers bound to the loop survive between calls.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        """Whether the loop's thread has been started."""
+        return self._loop is not None
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        """Return the loop, starting its thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name=self.name, daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float) -> T:
+        """Run a coroutine on the loop from sync code, cancelling it if timeout expires."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.get())
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
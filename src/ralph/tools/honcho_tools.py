@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
-import concurrent.futures
 import logging
 from typing import Any
 
@@ -11,10 +9,15 @@ from agno.run import RunContext  # noqa: TC002 - must be available at runtime fo
 from agno.tools import Toolkit
 
 from ralph.honcho import get_honcho
+from ralph.tools.background_loop import BackgroundLoop
 
 logger = logging.getLogger(__name__)
 
 _LOG_PREVIEW_LENGTH = 200
+_QUERY_TIMEOUT = 30
+
+# Long-lived loop for running Honcho queries from sync tool calls
+_query_loop = BackgroundLoop("honcho-tools")
 
 
 class HonchoTools(Toolkit):
@@ -53,14 +56,8 @@ class HonchoTools(Toolkit):
         try:
             honcho = get_honcho()
 
-            try:
-                asyncio.get_running_loop()
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    result = pool.submit(
-                        asyncio.run, honcho.query_dialectic(user_id, question)
-                    ).result(timeout=30)
-            except RuntimeError:
-                result = asyncio.run(honcho.query_dialectic(user_id, question))
+            # Works whether or not this thread has a running loop, without a new loop per call
+            result = _query_loop.run(honcho.query_dialectic(user_id, question), _QUERY_TIMEOUT)
 
             if result is None:
                 logger.debug("Dialectic returned None for user %s", user_id)
@@ -3,17 +3,73 @@
 from __future__ import annotations
 
 import asyncio
-import threading
-from typing import TYPE_CHECKING, Any
+import os
+from pathlib import Path
+from typing import Any
 
 import structlog
 from agno.tools.file import FileTools
 
-if TYPE_CHECKING:
-    from pathlib import Path
+from ralph.tools.background_loop import BackgroundLoop
 
 logger = structlog.get_logger()
 
+# Quiet period after the last .tex write before compiling
+COMPILE_DEBOUNCE_SECONDS = 0.4
+
+# Long-lived loop that runs auto-compiles, started on first use
+_compile_loop = BackgroundLoop("latex-compile")
+
+# Touched only on the compile loop: debounce timers, running compiles,
+# and paths written again while theirs was running
+_timers: dict[str, asyncio.TimerHandle] = {}
+_compiling: dict[str, asyncio.Task[None]] = {}
+_stale: set[str] = set()
+
+
+def compiles_pending() -> bool:
+    """Whether any auto-compile is waiting out its debounce or running."""
+    return bool(_timers or _compiling)
+
+
+def _schedule_compile(tex_path: str, user_id: str, chat_id: str | None) -> None:
+    """(Re)start the debounce timer for tex_path. Runs on the compile loop."""
+    timer = _timers.pop(tex_path, None)
+    if timer is not None:
+        timer.cancel()
+    _timers[tex_path] = asyncio.get_running_loop().call_later(
+        COMPILE_DEBOUNCE_SECONDS, _start_compile, tex_path, user_id, chat_id
+    )
+
+
+def _start_compile(tex_path: str, user_id: str, chat_id: str | None) -> None:
+    """Start a compile, or mark the running one stale. Runs on the compile loop."""
+    _timers.pop(tex_path, None)
+    if tex_path in _compiling:
+        _stale.add(tex_path)
+        logger.info("auto_compile_coalesced", path=tex_path)
+        return
+    _compiling[tex_path] = asyncio.get_running_loop().create_task(
+        _compile_until_current(tex_path, user_id, chat_id)
+    )
+
+
+async def _compile_until_current(tex_path: str, user_id: str, chat_id: str | None) -> None:
+    """Compile tex_path, repeating while it was rewritten during the previous compile."""
+    from ralph.artifacts import compile_and_push
+
+    while True:
+        try:
+            result = await compile_and_push(Path(tex_path), user_id, chat_id)
+            logger.info("auto_compile_result", path=tex_path, result=result)
+        except Exception:
+            logger.exception("auto_compile_failed", path=tex_path)
+
+        if tex_path not in _stale:
+            del _compiling[tex_path]
+            return
+        _stale.discard(tex_path)
+
 
 class HookedFileTools(FileTools):
     """
@@ -67,34 +123,21 @@ class HookedFileTools(FileTools):
 
     def _trigger_compile(self, file_name: str) -> None:
         """Trigger async compile_and_push from sync tool context."""
-        from pathlib import Path
-
+        # Plain string ops on this per-write path; a Path is only built once per compile
         tex_path = (
-            self.base_dir / file_name if not Path(file_name).is_absolute() else Path(file_name)
+            file_name
+            if os.path.isabs(file_name)  # noqa: PTH117
+            else os.path.join(self.base_dir, file_name)  # noqa: PTH118
         )
 
-        if not tex_path.exists():
-            logger.warning("tex_file_not_found_for_compile", path=str(tex_path))
+        if not os.path.isfile(tex_path):  # noqa: PTH113
+            logger.warning("tex_file_not_found_for_compile", path=tex_path)
             return
 
-        logger.info("auto_compile_triggered", path=str(tex_path), user_id=self._user_id)
+        logger.info("auto_compile_triggered", path=tex_path, user_id=self._user_id)
 
-        # Run compile_and_push in a background thread with its own event loop.
-        # Agno tool methods run synchronously, so there's typically no running
-        # event loop we can schedule onto.
-        thread = threading.Thread(
-            target=self._compile_in_thread,
-            args=(tex_path,),
-            daemon=True,
+        # Agno tool methods run synchronously, so hand off to the shared background
+        # loop. A burst of writes collapses into one compile after the last one.
+        _compile_loop.get().call_soon_threadsafe(
+            _schedule_compile, tex_path, self._user_id, self._chat_id
         )
-        thread.start()
-
-    def _compile_in_thread(self, tex_path: Path) -> None:
-        """Run async compilation in a new event loop on a background thread."""
-        from ralph.artifacts import compile_and_push
-
-        try:
-            result = asyncio.run(compile_and_push(tex_path, self._user_id, self._chat_id))
-            logger.info("auto_compile_result", path=str(tex_path), result=result)
-        except Exception:
-            logger.exception("auto_compile_failed", path=str(tex_path))
@@ -1,14 +1,28 @@
 """LaTeX and PDF viewer templates for note generation."""
 
+import string
+
+# Shown in the artifact panel when compilation fails; $message must be HTML-escaped
+COMPILE_ERROR_TEMPLATE = string.Template(
+    '<html><body style="font-family: sans-serif; padding: 20px;">'
+    '<h2 style="color: #dc3545;">Compilation Error</h2>'
+    '<pre style="background: #f8f9fa; padding: 16px; border-radius: 8px;'
+    ' overflow-x: auto;">$message</pre>'
+    "</body></html>"
+)
+
 # HTML template with embedded PDF.js viewer
 # No toolbar — full-bleed continuous scroll, fit-to-width
 # Uses legacy UMD build for broader iframe compatibility (no ES modules)
+# The worker is preloaded so its fetch overlaps pdf.min.js and the PDF decode
 PDF_VIEWER_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>%(title)s</title>
+    <link rel="preconnect" href="https://cdnjs.cloudflare.com" crossorigin>
+    <link rel="preload" as="script" href="https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.worker.min.js">
     <script src="https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.min.js"></script>
     <style>
         * { box-sizing: border-box; margin: 0; padding: 0; }
@@ -20,6 +34,9 @@ PDF_VIEWER_TEMPLATE = """<!DOCTYPE html>
             overflow-y: auto;
             overflow-x: hidden;
         }
+        .page-placeholder {
+            width: 100%%;
+        }
         .page-canvas {
             display: block;
             width: 100%%;
@@ -36,58 +53,114 @@ PDF_VIEWER_TEMPLATE = """<!DOCTYPE html>
     <div id="viewer"></div>
     <script>
         var pdfBase64 = '%(pdf_base64)s';
-        var pdfData = atob(pdfBase64);
-        var pdfBytes = new Uint8Array(pdfData.length);
-        for (var i = 0; i < pdfData.length; i++) {
-            pdfBytes[i] = pdfData.charCodeAt(i);
+
+        // Decode natively where possible instead of a per-byte JS loop
+        function decodePdf(b64) {
+            if (typeof Uint8Array.fromBase64 === 'function') {
+                return Promise.resolve(Uint8Array.fromBase64(b64));
+            }
+            return fetch('data:application/pdf;base64,' + b64)
+                .then(function(resp) { return resp.arrayBuffer(); })
+                .then(function(buf) { return new Uint8Array(buf); })
+                .catch(function() {
+                    // data: fetches can be blocked by the host's CSP
+                    var raw = atob(b64);
+                    var bytes = new Uint8Array(raw.length);
+                    for (var i = 0; i < raw.length; i++) {
+                        bytes[i] = raw.charCodeAt(i);
+                    }
+                    return bytes;
+                });
         }
 
         pdfjsLib.GlobalWorkerOptions.workerSrc = 'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.worker.min.js';
 
+        var MAX_CONCURRENT_RENDERS = 4;
+        var MAX_RENDER_DPR = 1.5;
         var pdfDoc = null;
-        var rendering = false;
+        var observer = null;
+        var generation = 0;
         var resizeTimer = null;
         var viewer = document.getElementById('viewer');
 
+        // Pages are laid out as sized placeholders and only rendered once they
+        // near the viewport, at most MAX_CONCURRENT_RENDERS at a time
         function renderAllPages() {
-            if (!pdfDoc || rendering) return;
-            rendering = true;
+            if (!pdfDoc) return;
+            var gen = ++generation;
             var scrollRatio = viewer.scrollHeight > 0 ? viewer.scrollTop / viewer.scrollHeight : 0;
-            viewer.innerHTML = '';
+            if (observer) observer.disconnect();
 
             pdfDoc.getPage(1).then(function(firstPage) {
+                if (gen !== generation) return;
                 var unscaledViewport = firstPage.getViewport({ scale: 1 });
                 var scale = viewer.clientWidth / unscaledViewport.width;
-                var dpr = window.devicePixelRatio || 1;
+                // Capped so HiDPI canvases don't balloon; CSS upscales the rest
+                var dpr = Math.min(window.devicePixelRatio || 1, MAX_RENDER_DPR);
+                var estimatedHeight = unscaledViewport.height * scale;
 
-                var chain = Promise.resolve();
-                for (var i = 1; i <= pdfDoc.numPages; i++) {
-                    (function(pageNum) {
-                        chain = chain.then(function() {
-                            return pdfDoc.getPage(pageNum).then(function(page) {
-                                var viewport = page.getViewport({ scale: scale * dpr });
-                                var canvas = document.createElement('canvas');
-                                canvas.className = 'page-canvas';
-                                canvas.width = viewport.width;
-                                canvas.height = viewport.height;
-                                viewer.appendChild(canvas);
-                                return page.render({
-                                    canvasContext: canvas.getContext('2d'),
-                                    viewport: viewport
-                                }).promise;
-                            });
+                var pending = [];
+                var inFlight = 0;
+
+                function pump() {
+                    while (inFlight < MAX_CONCURRENT_RENDERS && pending.length) {
+                        inFlight++;
+                        renderPage(pending.shift()).then(function() {
+                            inFlight--;
+                            pump();
+                        });
+                    }
+                }
+
+                function renderPage(placeholder) {
+                    var pageNum = +placeholder.dataset.page;
+                    return pdfDoc.getPage(pageNum).then(function(page) {
+                        if (gen !== generation) return;
+                        var viewport = page.getViewport({ scale: scale * dpr });
+                        var canvas = document.createElement('canvas');
+                        canvas.className = 'page-canvas';
+                        canvas.width = viewport.width;
+                        canvas.height = viewport.height;
+                        return page.render({
+                            canvasContext: canvas.getContext('2d', { willReadFrequently: false }),
+                            viewport: viewport
+                        }).promise.then(function() {
+                            if (gen !== generation) return;
+                            placeholder.style.height = '';
+                            placeholder.appendChild(canvas);
                         });
-                    })(i);
+                    }).catch(function() {});
                 }
 
-                chain.then(function() {
-                    rendering = false;
-                    viewer.scrollTop = scrollRatio * viewer.scrollHeight;
+                observer = new IntersectionObserver(function(entries) {
+                    entries.forEach(function(entry) {
+                        if (!entry.isIntersecting) return;
+                        observer.unobserve(entry.target);
+                        pending.push(entry.target);
+                    });
+                    pump();
+                }, { root: viewer, rootMargin: '200px 0px' });
+
+                var fragment = document.createDocumentFragment();
+                for (var i = 1; i <= pdfDoc.numPages; i++) {
+                    var placeholder = document.createElement('div');
+                    placeholder.className = 'page-placeholder';
+                    placeholder.dataset.page = i;
+                    placeholder.style.height = estimatedHeight + 'px';
+                    fragment.appendChild(placeholder);
+                }
+                viewer.innerHTML = '';
+                viewer.appendChild(fragment);
+                viewer.querySelectorAll('.page-placeholder').forEach(function(el) {
+                    observer.observe(el);
                 });
+                viewer.scrollTop = scrollRatio * viewer.scrollHeight;
             });
         }
 
-        pdfjsLib.getDocument({ data: pdfBytes }).promise.then(function(pdf) {
+        decodePdf(pdfBase64).then(function(pdfBytes) {
+            return pdfjsLib.getDocument({ data: pdfBytes }).promise;
+        }).then(function(pdf) {
             pdfDoc = pdf;
             renderAllPages();
         }).catch(function(err) {
@@ -3,42 +3,118 @@
 from __future__ import annotations
 
 import asyncio
-import concurrent.futures
 import logging
+import time
 from typing import Any
 
 from agno.run import RunContext  # noqa: TC002 - must be available at runtime for Agno
 from agno.tools import Toolkit
 
-from ralph.dolt import DoltClient, MemoryBlock
+from ralph.dolt import DoltClient, DoltConnectionError, MemoryBlock
+from ralph.tools.background_loop import BackgroundLoop
 
 logger = logging.getLogger(__name__)
 
+# How long list/read results are reused within a turn (seconds); short so
+# edits the user approves elsewhere show up quickly
+BLOCK_CACHE_TTL = 3.0
 
-def _run_async_with_fresh_client(async_fn: Any) -> Any:
+# Long-lived loop hosting the tools' shared DoltClient, started on first use.
+# The client's connection pool is bound to this loop, so every call runs here.
+_dolt_loop = BackgroundLoop("memory-block-dolt")
+
+# Touched only on the Dolt loop
+_dolt_client: DoltClient | None = None
+_dolt_client_lock = asyncio.Lock()
+
+
+async def _get_pooled_client() -> DoltClient:
+    """Return the shared DoltClient, connecting on first use. Runs on the Dolt loop."""
+    global _dolt_client
+    async with _dolt_client_lock:
+        if _dolt_client is None:
+            client = DoltClient()
+            await client.connect()
+            _dolt_client = client
+    return _dolt_client
+
+
+async def _reset_pooled_client(failed: DoltClient) -> None:
+    """Drop the shared client if it is still the one that failed. Runs on the Dolt loop."""
+    global _dolt_client
+    async with _dolt_client_lock:
+        if _dolt_client is failed:
+            _dolt_client = None
+            await failed.disconnect()
+
+
+def _run_with_pooled_client(async_fn: Any, retry: bool = False) -> Any:
     """
     Run an async function that needs DoltClient from sync context.
 
-    Creates a fresh DoltClient for thread-pool executions to avoid
-    event loop attachment issues with the global singleton.
+    The coroutine is submitted to the background Dolt loop and handed the
+    shared, already-connected client, so tool calls reuse pooled connections
+    instead of connecting and disconnecting every time. If the connection
+    drops mid-call, the pool is rebuilt; with retry=True the call is rerun
+    once on it. Only reads should retry: a write may have committed before
+    the connection dropped.
     """
 
     async def _execute() -> Any:
-        client = DoltClient()
-        await client.connect()
+        client = await _get_pooled_client()
         try:
             return await async_fn(client)
-        finally:
-            await client.disconnect()
-
-    try:
-        asyncio.get_running_loop()
-        # In async context, use thread pool with fresh client
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            return pool.submit(asyncio.run, _execute()).result(timeout=30)
-    except RuntimeError:
-        # No running loop, can use asyncio.run directly
-        return asyncio.run(_execute())
+        except DoltConnectionError as e:
+            await _reset_pooled_client(client)
+            if not retry:
+                raise
+            logger.info("Dolt connection lost, retrying on a new pool: %s", e)
+            return await async_fn(await _get_pooled_client())
+
+    return _dolt_loop.run(_execute(), timeout=30)
+
+
+async def close_pooled_client() -> None:
+    """Disconnect the tools' shared DoltClient, if one was opened. Call on server shutdown."""
+    if not _dolt_loop.started:
+        return
+
+    async def _close() -> None:
+        if _dolt_client is not None:
+            await _reset_pooled_client(_dolt_client)
+
+    # The client's pool belongs to the Dolt loop, so it must be closed there
+    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_close(), _dolt_loop.get()))
+
+
+def _apply_edit(
+    block_label: str,
+    body: str,
+    old_string: str,
+    new_string: str,
+    replace_all: bool,
+) -> tuple[str | None, str | None]:
+    """Apply a string-replacement edit to a block body. Returns (new_body, error)."""
+    # One scan gives both the occurrence count and the pieces to rejoin
+    parts = body.split(old_string)
+    occurrence_count = len(parts) - 1
+
+    if not occurrence_count:
+        return None, (
+            f"Error: old_string not found in block '{block_label}'. "
+            "Make sure you've read the block first and the text matches exactly "
+            "(including whitespace and newlines)."
+        )
+
+    if occurrence_count > 1 and not replace_all:
+        return None, (
+            f"Error: old_string appears {occurrence_count} times in block '{block_label}'. "
+            "Provide a larger unique string with more surrounding context, "
+            "or set replace_all=True to replace all occurrences."
+        )
+
+    # Unique match, or replace_all: every occurrence is replaced
+    return new_string.join(parts), None
 
 
 def _get_user_id(run_context: RunContext) -> str | None:
@@ -65,6 +141,9 @@ class MemoryBlockTools(Toolkit):
 
     def __init__(self, agent_id: str = "ralph", **kwargs: Any) -> None:
         self.agent_id = agent_id
+        # user_id -> (monotonic deadline, all of the user's blocks by label). One
+        # query serves the usual list-then-read-then-propose turn.
+        self._blocks_cache: dict[str, tuple[float, dict[str, MemoryBlock]]] = {}
 
         tools = [
             self.list_memory_blocks,
@@ -74,6 +153,19 @@ class MemoryBlockTools(Toolkit):
 
         super().__init__(name="memory_block_tools", tools=tools, **kwargs)
 
+    def _get_blocks(self, user_id: str) -> dict[str, MemoryBlock]:
+        """Return all of the user's blocks, from cache if fetched within BLOCK_CACHE_TTL."""
+        cached = self._blocks_cache.get(user_id)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+        async def _fetch(dolt: DoltClient) -> dict[str, MemoryBlock]:
+            return await dolt.get_blocks(user_id)
+
+        blocks: dict[str, MemoryBlock] = _run_with_pooled_client(_fetch, retry=True)
+        self._blocks_cache[user_id] = (time.monotonic() + BLOCK_CACHE_TTL, blocks)
+        return blocks
+
     def list_memory_blocks(self, run_context: RunContext) -> str:
         """List all available memory blocks for the current student."""
         user_id = _get_user_id(run_context)
@@ -81,21 +173,14 @@ class MemoryBlockTools(Toolkit):
             return "Unable to identify student. No user context available."
 
         try:
-
-            async def _list(dolt: DoltClient) -> list[MemoryBlock]:
-                return await dolt.list_blocks(user_id)
-
-            blocks = _run_async_with_fresh_client(_list)
-
+            blocks = self._get_blocks(user_id)
             if not blocks:
                 return "No memory blocks exist for this student yet."
 
-            lines = ["Available memory blocks:", ""]
-            for block in blocks:
-                title = block.title or block.label.replace("_", " ").title()
-                lines.append(f"- {block.label}: {title}")
-
-            return "\n".join(lines)
+            listing = "\n".join(
+                f"- {block.label}: {block.display_title}" for block in blocks.values()
+            )
+            return f"Available memory blocks:\n\n{listing}"
 
         except Exception as e:
             logger.warning("list_memory_blocks failed: %s", e)
@@ -108,19 +193,12 @@ class MemoryBlockTools(Toolkit):
             return "Unable to identify student. No user context available."
 
         try:
-
-            async def _read(dolt: DoltClient) -> MemoryBlock | None:
-                return await dolt.get_block(user_id, block_label)
-
-            block = _run_async_with_fresh_client(_read)
+            block = self._get_blocks(user_id).get(block_label)
 
             if not block:
                 return f"Memory block '{block_label}' not found."
 
-            title = block.title or block_label.replace("_", " ").title()
-            body = block.body or "(empty)"
-
-            return f"# {title}\n\n{body}"
+            return f"# {block.display_title}\n\n{block.body or '(empty)'}"
 
         except Exception as e:
             logger.warning("read_memory_block failed for %s: %s", block_label, e)
@@ -159,33 +237,28 @@ class MemoryBlockTools(Toolkit):
             return "Error: reasoning is required to explain the edit to the user."
 
         try:
+            # A mismatch against a block read moments ago fails without touching Dolt.
+            # The cached copy is never proposed from: it may predate an approved edit.
+            cached = self._blocks_cache.get(user_id)
+            if cached is not None and time.monotonic() < cached[0]:
+                cached_block = cached[1].get(block_label)
+                if cached_block is not None:
+                    _, error = _apply_edit(
+                        block_label, cached_block.body or "", old_string, new_string, replace_all
+                    )
+                    if error:
+                        return error
 
             async def _propose(dolt: DoltClient) -> tuple[str | None, str | None]:
                 block = await dolt.get_block(user_id, block_label)
                 if not block:
                     return None, f"Error: Memory block '{block_label}' not found."
 
-                current_body = block.body or ""
-
-                if old_string not in current_body:
-                    return None, (
-                        f"Error: old_string not found in block '{block_label}'. "
-                        "Make sure you've read the block first and the text matches exactly "
-                        "(including whitespace and newlines)."
-                    )
-
-                occurrence_count = current_body.count(old_string)
-                if occurrence_count > 1 and not replace_all:
-                    return None, (
-                        f"Error: old_string appears {occurrence_count} times in block '{block_label}'. "
-                        "Provide a larger unique string with more surrounding context, "
-                        "or set replace_all=True to replace all occurrences."
-                    )
-
-                if replace_all:
-                    new_body = current_body.replace(old_string, new_string)
-                else:
-                    new_body = current_body.replace(old_string, new_string, 1)
+                new_body, error = _apply_edit(
+                    block_label, block.body or "", old_string, new_string, replace_all
+                )
+                if new_body is None:
+                    return None, error
 
                 branch_name = await dolt.create_proposal(
                     user_id=user_id,
@@ -198,11 +271,13 @@ class MemoryBlockTools(Toolkit):
 
                 return branch_name, None
 
-            branch_name, error = _run_async_with_fresh_client(_propose)
+            branch_name, error = _run_with_pooled_client(_propose)
 
             if error:
                 return error
 
+            self._blocks_cache.pop(user_id, None)
+
             logger.info(
                 "Memory edit proposed: user=%s block=%s branch=%s",
                 user_id,
@@ -0,0 +1 @@
+"""Tests for workspace sync."""
@@ -0,0 +1,79 @@
+"""Tests for scheduling file syncs from tool post-hooks."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from pathlib import Path
+from unittest.mock import patch
+
+from ralph.sync import hooks
+
+
+class TestScheduleSync:
+    """Tests for bounding and coalescing hook-triggered syncs."""
+
+    async def test_repeat_writes_coalesce_per_path(self) -> None:
+        """Writes to a path while its sync runs should collapse into one more sync."""
+        path = Path("/ws/notes.md")
+        release = asyncio.Event()
+        runs: list[int] = []
+
+        async def _sync(n: int) -> None:
+            runs.append(n)
+            await release.wait()
+
+        for n in range(5):
+            hooks.schedule_sync(path, functools.partial(_sync, n))
+        await asyncio.sleep(0)
+        release.set()
+        await hooks.wait_for_syncs()
+
+        # The first write, then only the latest of the ones that arrived meanwhile
+        assert runs == [0, 4]
+
+    async def test_paths_beyond_cap_wait_for_a_slot(self) -> None:
+        """No more than MAX_INFLIGHT syncs should run at once; the rest still complete."""
+        release = asyncio.Event()
+        in_flight = peak = 0
+        done: list[Path] = []
+
+        async def _sync(path: Path) -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await release.wait()
+            in_flight -= 1
+            done.append(path)
+
+        paths = [Path(f"/ws/note{i}.md") for i in range(5)]
+        with patch.object(hooks, "MAX_INFLIGHT", 2):
+            for path in paths:
+                hooks.schedule_sync(path, functools.partial(_sync, path))
+            await asyncio.sleep(0)
+            started = in_flight
+
+            release.set()
+            await hooks.wait_for_syncs()
+
+        assert started == peak == 2
+        assert sorted(done) == sorted(paths)
+
+    async def test_failed_sync_frees_its_path(self) -> None:
+        """An exception from one sync should not block later syncs of the same path."""
+        path = Path("/ws/broken.md")
+        runs: list[str] = []
+
+        async def _boom() -> None:
+            runs.append("boom")
+            raise RuntimeError("upload failed")
+
+        async def _ok() -> None:
+            runs.append("ok")
+
+        hooks.schedule_sync(path, _boom)
+        await hooks.wait_for_syncs()
+        hooks.schedule_sync(path, _ok)
+        await hooks.wait_for_syncs()
+
+        assert runs == ["boom", "ok"]
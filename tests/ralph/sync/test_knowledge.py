@@ -0,0 +1,97 @@
+"""Tests for KnowledgeService."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ralph.sync.knowledge import NEGATIVE_CACHE_TTL, KnowledgeService
+
+
+@pytest.fixture
+def mock_client() -> MagicMock:
+    """Create a mock OpenWebUIClient."""
+    client = MagicMock()
+    client.list_knowledge = AsyncMock(return_value=[])
+    client.get_or_create_knowledge = AsyncMock(return_value={"id": "kb-1"})
+    return client
+
+
+class TestGetKnowledgeId:
+    """Tests for lookup-only KB resolution."""
+
+    async def test_returns_existing_id(self, mock_client: MagicMock) -> None:
+        """Should find the user's KB by name and cache it."""
+        mock_client.list_knowledge.return_value = [{"id": "kb-9", "name": "workspace-u1"}]
+        service = KnowledgeService(mock_client)
+
+        assert await service.get_knowledge_id("u1") == "kb-9"
+        assert await service.get_knowledge_id("u1") == "kb-9"
+        mock_client.list_knowledge.assert_awaited_once()
+
+    async def test_missing_kb_is_negative_cached(self, mock_client: MagicMock) -> None:
+        """Should not re-list knowledge bases while the negative entry is fresh."""
+        service = KnowledgeService(mock_client)
+
+        assert await service.get_knowledge_id("u1") is None
+        assert await service.get_knowledge_id("u1") is None
+        mock_client.list_knowledge.assert_awaited_once()
+
+    async def test_negative_cache_expires(self, mock_client: MagicMock) -> None:
+        """Should look again once the negative TTL has passed."""
+        service = KnowledgeService(mock_client)
+
+        with patch("ralph.sync.knowledge.time.monotonic", return_value=100.0):
+            assert await service.get_knowledge_id("u1") is None
+        with patch(
+            "ralph.sync.knowledge.time.monotonic", return_value=100.0 + NEGATIVE_CACHE_TTL + 1
+        ):
+            assert await service.get_knowledge_id("u1") is None
+
+        assert mock_client.list_knowledge.await_count == 2
+
+    async def test_create_invalidates_negative_cache(self, mock_client: MagicMock) -> None:
+        """Should return the new KB after get_or_create_knowledge succeeds."""
+        service = KnowledgeService(mock_client)
+
+        assert await service.get_knowledge_id("u1") is None
+        assert await service.get_or_create_knowledge("u1") == "kb-1"
+        assert await service.get_knowledge_id("u1") == "kb-1"
+
+    async def test_clear_cache(self, mock_client: MagicMock) -> None:
+        """Should drop negative entries so the next lookup hits the API."""
+        service = KnowledgeService(mock_client)
+
+        await service.get_knowledge_id("u1")
+        service.clear_cache("u1")
+        await service.get_knowledge_id("u1")
+
+        assert mock_client.list_knowledge.await_count == 2
+
+
+class TestRefresh:
+    """Tests for KB cache warmup."""
+
+    async def test_refresh_populates_cache(self, mock_client: MagicMock) -> None:
+        """Should cache every prefixed KB and ignore others."""
+        mock_client.list_knowledge.return_value = [
+            {"id": "kb-1", "name": "workspace-u1"},
+            {"id": "kb-2", "name": "workspace-u2"},
+            {"id": "kb-3", "name": "shared-docs"},
+        ]
+        service = KnowledgeService(mock_client)
+
+        assert await service.refresh() == 2
+        assert await service.get_knowledge_id("u2") == "kb-2"
+        mock_client.list_knowledge.assert_awaited_once()
+
+    async def test_refresh_clears_negative_entries(self, mock_client: MagicMock) -> None:
+        """Should forget 'no KB' once a refresh finds one."""
+        service = KnowledgeService(mock_client)
+        assert await service.get_knowledge_id("u1") is None
+
+        mock_client.list_knowledge.return_value = [{"id": "kb-1", "name": "workspace-u1"}]
+        await service.refresh()
+
+        assert await service.get_knowledge_id("u1") == "kb-1"
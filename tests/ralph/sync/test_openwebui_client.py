@@ -0,0 +1,66 @@
+"""Tests for the sync OpenWebUIClient."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from ralph.sync.openwebui_client import OpenWebUIClient, OpenWebUIError
+
+
+def make_client(handler: httpx.MockTransport) -> OpenWebUIClient:
+    """Create a client whose HTTP calls go to a mock transport."""
+    return OpenWebUIClient(base_url="http://openwebui.test", api_key="test-key", transport=handler)
+
+
+class TestConditionalRequests:
+    """Tests for ETag handling on knowledge endpoints."""
+
+    async def test_not_modified_returns_cached_body(self) -> None:
+        """Should resend the ETag and reuse the cached list on 304."""
+        seen: list[str | None] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json={"items": [{"id": "kb-1", "name": "workspace-u1"}]},
+                headers={"ETag": '"v1"'},
+            )
+
+        async with make_client(httpx.MockTransport(handler)) as client:
+            first = await client.list_knowledge()
+            second = await client.list_knowledge()
+
+        assert first == second == [{"id": "kb-1", "name": "workspace-u1"}]
+        assert seen == [None, '"v1"']
+
+    async def test_no_etag_means_no_conditional_header(self) -> None:
+        """Should not send If-None-Match when the server sent no ETag."""
+        seen: list[str | None] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("if-none-match"))
+            return httpx.Response(200, json={"id": "kb-1", "files": None})
+
+        async with make_client(httpx.MockTransport(handler)) as client:
+            assert await client.get_knowledge_files("kb-1") == []
+            assert await client.get_knowledge_files("kb-1") == []
+
+        assert seen == [None, None]
+
+
+class TestLifecycle:
+    """Tests for opening and closing the client."""
+
+    async def test_use_after_close_raises_openwebui_error(self) -> None:
+        """Calls on a closed client should fail with OpenWebUIError, not httpx's RuntimeError."""
+        client = make_client(httpx.MockTransport(lambda _: httpx.Response(200, json={})))
+        await client.close()
+
+        with pytest.raises(OpenWebUIError, match="closed"):
+            await client.list_knowledge()
+        with pytest.raises(OpenWebUIError, match="closed"):
+            await client.get_file_content("file-1")
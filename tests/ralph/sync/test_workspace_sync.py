@@ -0,0 +1,510 @@
+"""Tests for WorkspaceSync scanning and file operations."""
+
+# The batching test wraps the private per-thread hashing helper
+# pyright: reportPrivateUsage=false
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from ralph.sync.models import FileMetadata
+from ralph.sync.workspace_sync import (
+    DEFAULT_IGNORE_PATTERNS,
+    SYNC_CONCURRENCY,
+    WorkspaceSync,
+    _hash_batch,
+    compile_ignore_patterns,
+    compute_hash,
+    hash_file,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from ralph.sync.models import HashAlgo
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    """Create a small workspace tree."""
+    (tmp_path / "notes.md").write_text("# Notes\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("print('hi')\n")
+    return tmp_path
+
+
+def leftover_temp_files(workspace: Path) -> list[Path]:
+    """List temp files an atomic state write left behind."""
+    return list(workspace.glob(".sync_state.json.*.tmp"))
+
+
+class TestHashing:
+    """Tests for content hashing."""
+
+    def test_hash_file_matches_compute_hash(self, tmp_path: Path) -> None:
+        """Streaming a file should give the same hash as hashing its bytes."""
+        path = tmp_path / "data.bin"
+        content = bytes(range(256)) * 1000
+        path.write_bytes(content)
+
+        assert hash_file(path) == compute_hash(content)
+        assert hash_file(path).startswith("sha256:")
+
+    def test_reused_buffer_does_not_leak_between_files(self, tmp_path: Path) -> None:
+        """A short file hashed after a long one should only see its own bytes."""
+        big = tmp_path / "big.bin"
+        big.write_bytes(b"x" * 300_000)
+        small = tmp_path / "small.txt"
+        small.write_bytes(b"hi")
+
+        hash_file(big)
+        assert hash_file(small) == compute_hash(b"hi")
+
+
+class TestHashAlgorithms:
+    """Tests for the optional fast hash algorithms."""
+
+    @pytest.mark.parametrize(("algo", "module"), [("blake3", "blake3"), ("xxh3", "xxhash")])
+    def test_prefix_and_streaming_agree(self, tmp_path: Path, algo: HashAlgo, module: str) -> None:
+        """Should tag hashes with the algorithm and stream to the same digest."""
+        pytest.importorskip(module)
+        path = tmp_path / "data.bin"
+        content = b"abc" * 100_000
+        path.write_bytes(content)
+
+        assert compute_hash(content, algo).startswith(f"{algo}:")
+        assert hash_file(path, algo) == compute_hash(content, algo)
+
+    async def test_algorithm_change_rehashes(self, workspace: Path) -> None:
+        """Stored hashes from another algorithm should not pass the stat gate."""
+        pytest.importorskip("blake3")
+        await WorkspaceSync(workspace_path=workspace, user_id="u1").refresh_index()
+
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1", hash_algo="blake3")
+        await sync.refresh_index()
+
+        state = await sync.load_state()
+        assert all(meta.hash.startswith("blake3:") for meta in state.files.values())
+
+    def test_missing_package_falls_back_to_sha256(self, tmp_path: Path) -> None:
+        """Should use sha256 when the requested hasher isn't installed."""
+        with patch("ralph.sync.workspace_sync.xxhash", None):
+            sync = WorkspaceSync(workspace_path=tmp_path, user_id="u1", hash_algo="xxh3")
+
+        assert sync.hash_algo == "sha256"
+
+
+class TestScanWorkspace:
+    """Tests for scan_workspace."""
+
+    async def test_scan_lists_files_with_hashes(self, workspace: Path) -> None:
+        """Should index every file by relative path."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+
+        files = await sync.scan_workspace()
+
+        assert set(files) == {"notes.md", "src/main.py"}
+        assert files["notes.md"].hash == compute_hash(b"# Notes\n")
+        assert files["src/main.py"].size == len("print('hi')\n")
+
+    async def test_scan_missing_workspace(self, tmp_path: Path) -> None:
+        """Should return nothing for a workspace that doesn't exist."""
+        sync = WorkspaceSync(workspace_path=tmp_path / "missing", user_id="u1")
+
+        assert await sync.scan_workspace() == {}
+
+    async def test_unchanged_files_are_not_rehashed(self, workspace: Path) -> None:
+        """Should reuse stored hashes when size and mtime match."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+        await sync.refresh_index()
+
+        with patch("ralph.sync.workspace_sync.hash_file") as mock_hash:
+            files = await sync.scan_workspace()
+
+        mock_hash.assert_not_called()
+        assert files["notes.md"].hash == compute_hash(b"# Notes\n")
+
+    async def test_scanned_entries_are_valid_models(self, workspace: Path) -> None:
+        """Unvalidated scan entries should survive a validating round trip unchanged."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+        files = await sync.scan_workspace()
+
+        for meta in files.values():
+            assert FileMetadata.model_validate_json(meta.model_dump_json()) == meta
+
+    async def test_legacy_entries_without_mtime_ns(self, workspace: Path) -> None:
+        """State saved before mtime_ns existed should still pass the stat gate."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+        await sync.refresh_index()
+        state = await sync.load_state()
+        state.files = {
+            path: meta.model_copy(update={"mtime_ns": None}) for path, meta in state.files.items()
+        }
+
+        with patch("ralph.sync.workspace_sync.hash_file") as mock_hash:
+            files = await sync.scan_workspace()
+
+        mock_hash.assert_not_called()
+        assert files["notes.md"].mtime_ns == (workspace / "notes.md").stat().st_mtime_ns
+
+    async def test_changed_file_is_rehashed(self, workspace: Path) -> None:
+        """Should hash again when the size changes."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+        await sync.refresh_index()
+
+        (workspace / "notes.md").write_text("# Notes, longer now\n")
+        files = await sync.scan_workspace()
+
+        assert files["notes.md"].hash == compute_hash(b"# Notes, longer now\n")
+
+    async def test_force_rehash(self, workspace: Path) -> None:
+        """Should hash every file when force_rehash is set."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+        await sync.refresh_index()
+
+        with patch("ralph.sync.workspace_sync.hash_file", return_value="sha256:x") as mock_hash:
+            await sync.scan_workspace(force_rehash=True)
+
+        assert mock_hash.call_count == 2
+
+    async def test_ignored_directories_are_not_entered(self, workspace: Path) -> None:
+        """Should prune ignored directories instead of listing their contents."""
+        (workspace / "node_modules" / "pkg").mkdir(parents=True)
+        (workspace / "node_modules" / "pkg" / "index.js").write_text("x")
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+
+        with patch("ralph.sync.workspace_sync.os.scandir", wraps=os.scandir) as mock_scandir:
+            files = await sync.scan_workspace()
+
+        scanned = [call.args[0] for call in mock_scandir.call_args_list]
+        assert not any("node_modules" in path for path in scanned)
+        assert set(files) == {"notes.md", f"src{os.sep}main.py"}
+
+    async def test_small_files_are_hashed_in_batches(self, tmp_path: Path) -> None:
+        """Should hash many small files in a few thread calls, not one each."""
+        for i in range(20):
+            (tmp_path / f"note{i}.md").write_text(f"note {i}")
+        sync = WorkspaceSync(workspace_path=tmp_path, user_id="u1")
+
+        with patch("ralph.sync.workspace_sync._hash_batch", wraps=_hash_batch) as mock_batch:
+            files = await sync.scan_workspace()
+
+        assert mock_batch.call_count == 2
+        assert files["note7.md"].hash == compute_hash(b"note 7")
+
+
+class TestSyncState:
+    """Tests for persisting sync state."""
+
+    async def test_state_round_trip(self, workspace: Path) -> None:
+        """Saved state should load back, with no temp file left behind."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+        await sync.refresh_index()
+
+        reloaded = await WorkspaceSync(workspace_path=workspace, user_id="u1").load_state()
+
+        assert set(reloaded.files) == {"notes.md", f"src{os.sep}main.py"}
+        assert not leftover_temp_files(workspace)
+
+    async def test_concurrent_saves_do_not_clobber(self, workspace: Path) -> None:
+        """Overlapping saves should each use their own temp file and leave valid state."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+        await sync.refresh_index()
+
+        await asyncio.gather(*(sync.save_state() for _ in range(8)))
+
+        reloaded = await WorkspaceSync(workspace_path=workspace, user_id="u1").load_state()
+        assert set(reloaded.files) == {"notes.md", f"src{os.sep}main.py"}
+        assert not leftover_temp_files(workspace)
+
+    async def test_corrupt_state_starts_fresh(self, workspace: Path) -> None:
+        """An unreadable state file should be replaced by an empty state."""
+        (workspace / ".sync_state.json").write_bytes(b"{not json")
+
+        state = await WorkspaceSync(workspace_path=workspace, user_id="u1").load_state()
+
+        assert state.files == {}
+
+
+class TestWriteFile:
+    """Tests for writing files through WorkspaceSync."""
+
+    async def test_write_hashes_content_and_records_mtime(self, tmp_path: Path) -> None:
+        """Written files should be hashed in one pass and pass the next scan's stat gate."""
+        content = bytes(range(256)) * 2000
+        sync = WorkspaceSync(workspace_path=tmp_path, user_id="u1")
+
+        meta = await sync.write_file("data/blob.bin", content)
+
+        assert meta.hash == compute_hash(content)
+        assert (tmp_path / "data" / "blob.bin").read_bytes() == content
+        with patch("ralph.sync.workspace_sync.hash_file") as mock_hash:
+            await sync.scan_workspace()
+        mock_hash.assert_not_called()
+
+
+class TestPathContainment:
+    """Tests for keeping file operations inside the workspace."""
+
+    @pytest.mark.parametrize("rel_path", ["../outside.txt", "src/../../outside.txt", "/etc/hosts"])
+    async def test_escaping_paths_are_rejected(self, workspace: Path, rel_path: str) -> None:
+        """Should refuse paths that leave the workspace."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+
+        with pytest.raises(ValueError, match="escapes workspace"):
+            await sync.read_file(rel_path)
+
+    async def test_symlink_escape_is_rejected(
+        self, workspace: Path, tmp_path_factory: pytest.TempPathFactory
+    ) -> None:
+        """Should refuse a symlink inside the workspace that points outside it."""
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "secret.txt").write_text("secret")
+        (workspace / "link").symlink_to(outside)
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+
+        with pytest.raises(ValueError, match="escapes workspace"):
+            await sync.read_file("link/secret.txt")
+
+    async def test_sync_skips_symlinked_file_outside(
+        self, workspace: Path, tmp_path_factory: pytest.TempPathFactory, mock_client: AsyncMock
+    ) -> None:
+        """A symlinked file pointing outside the workspace should never be uploaded."""
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "secret.txt").write_text("secret")
+        (workspace / "leak.md").symlink_to(outside / "secret.txt")
+        sync = WorkspaceSync(workspace, "u1", openwebui_client=mock_client)
+
+        result = await sync.sync_to_openwebui()
+
+        uploaded = [name for name, _ in mock_client.upload_files_batch.call_args.args[0]]
+        assert "leak.md" not in uploaded
+        assert any("escapes workspace" in error for error in result.errors)
+
+    async def test_normalized_paths_inside_are_allowed(self, workspace: Path) -> None:
+        """Should accept paths that only wander within the workspace."""
+        sync = WorkspaceSync(workspace_path=workspace, user_id="u1")
+
+        assert await sync.read_file("src/../notes.md") == b"# Notes\n"
+
+
+class TestIgnoreRules:
+    """Tests for compiled ignore patterns."""
+
+    @pytest.mark.parametrize(
+        ("name", "ignored"),
+        [
+            ("notes.md", False),
+            (".git", True),
+            ("__pycache__", True),
+            ("cache.tmp", True),
+            (".env", True),
+            (".env.local", True),
+            ("environment.md", False),
+            ("node_modules", True),
+            (".sync_state.json", True),
+        ],
+    )
+    def test_default_patterns(self, name: str, ignored: bool) -> None:
+        """Should match literals, suffixes, and globs against a single path component."""
+        rules = compile_ignore_patterns(DEFAULT_IGNORE_PATTERNS)
+
+        assert rules.matches(name) is ignored
+
+    async def test_matching_directory_prunes_subtree(self, tmp_path: Path) -> None:
+        """A directory whose name matches, even via a glob, should be skipped entirely."""
+        (tmp_path / "notes.md").write_text("keep")
+        for ignored_dir in ("node_modules/pkg", ".env.d"):
+            (tmp_path / ignored_dir).mkdir(parents=True)
+            (tmp_path / ignored_dir / "index.md").write_text("skip")
+
+        files = await WorkspaceSync(workspace_path=tmp_path, user_id="u1").scan_workspace()
+
+        assert set(files) == {"notes.md"}
+
+    def test_pattern_kinds_are_split(self) -> None:
+        """Should only fall back to a regex for non-trivial globs."""
+        rules = compile_ignore_patterns({"dist", "*.log", "tmp-??"})
+
+        assert rules.exact == frozenset({"dist"})
+        assert rules.suffixes == (".log",)
+        assert rules.pattern is not None
+        assert rules.matches("tmp-01")
+        assert not rules.matches("tmp-001")
+
+
+@pytest.fixture
+def mock_client() -> AsyncMock:
+    """OpenWebUI client double that hands out sequential file ids and tracks the KB."""
+    client = AsyncMock()
+    client.get_or_create_knowledge.return_value = {"id": "kb-1"}
+    remote_ids: set[str] = set()
+    client.remote_ids = remote_ids
+
+    async def _knowledge_files(_kb_id: str) -> list[dict[str, str]]:
+        return [{"id": file_id} for file_id in remote_ids]
+
+    async def _add_to_knowledge(_kb_id: str, file_id: str) -> None:
+        remote_ids.add(file_id)
+
+    async def _delete(file_id: str) -> None:
+        remote_ids.discard(file_id)
+
+    client.get_knowledge_files.side_effect = _knowledge_files
+    client.add_file_to_knowledge.side_effect = _add_to_knowledge
+    client.delete_file.side_effect = _delete
+
+    async def _upload_batch(
+        items: list[tuple[str, Path]], max_concurrency: int | None = None
+    ) -> list[dict[str, str]]:
+        start = client.upload_files_batch.await_count
+        return [{"id": f"file-{start}-{i}"} for i in range(len(items))]
+
+    client.upload_files_batch.side_effect = _upload_batch
+    return client
+
+
+class TestHashCache:
+    """Tests for reusing uploads by content hash."""
+
+    async def test_rename_reuses_uploaded_file(
+        self, tmp_path: Path, mock_client: AsyncMock
+    ) -> None:
+        """A renamed file should reuse its remote copy instead of uploading again."""
+        (tmp_path / "draft.md").write_text("same content")
+        sync = WorkspaceSync(tmp_path, "u1", openwebui_client=mock_client)
+        first = await sync.sync_to_openwebui()
+        file_id = sync._state.files["draft.md"].openwebui_file_id  # type: ignore[union-attr]
+
+        (tmp_path / "draft.md").rename(tmp_path / "final.md")
+        second = await sync.sync_to_openwebui()
+
+        assert first.files_uploaded == 1
+        assert second.files_uploaded == 0
+        assert second.files_deleted == 1
+        assert sync._state.files["final.md"].openwebui_file_id == file_id  # type: ignore[union-attr]
+        mock_client.delete_file.assert_not_awaited()
+        mock_client.get_knowledge_files.assert_awaited_once()
+
+    async def test_remotely_deleted_file_is_uploaded_again(
+        self, tmp_path: Path, mock_client: AsyncMock
+    ) -> None:
+        """A cached id no longer in the KB should be forgotten, not reused."""
+        (tmp_path / "draft.md").write_text("same content")
+        sync = WorkspaceSync(tmp_path, "u1", openwebui_client=mock_client)
+        await sync.sync_to_openwebui()
+        file_id = sync._state.files["draft.md"].openwebui_file_id  # type: ignore[union-attr]
+
+        # e.g. removed by name from the hook path
+        mock_client.remote_ids.discard(file_id)
+        (tmp_path / "draft.md").rename(tmp_path / "final.md")
+        result = await sync.sync_to_openwebui()
+
+        assert result.files_uploaded == 1
+        assert sync._state.files["final.md"].openwebui_file_id != file_id  # type: ignore[union-attr]
+        assert file_id not in sync._state.hash_cache.values()  # type: ignore[union-attr]
+
+    async def test_copy_keeps_id_claimed_while_original_changes(
+        self, tmp_path: Path, mock_client: AsyncMock
+    ) -> None:
+        """A copy reusing an id must stop the edited original from deleting it mid-check."""
+        (tmp_path / "a.md").write_text("shared")
+        sync = WorkspaceSync(tmp_path, "u1", openwebui_client=mock_client)
+        await sync.sync_to_openwebui()
+        file_id = sync._state.files["a.md"].openwebui_file_id  # type: ignore[union-attr]
+
+        (tmp_path / "b.md").write_text("shared")
+        (tmp_path / "a.md").write_text("edited")
+        scanned = await sync.scan_workspace()
+        # b.md first, so its cache check is in flight while a.md releases the old id
+        result = await sync.sync_to_openwebui(
+            current_files={"b.md": scanned["b.md"], "a.md": scanned["a.md"]}
+        )
+
+        assert not result.errors
+        assert sync._state.files["b.md"].openwebui_file_id == file_id  # type: ignore[union-attr]
+        assert file_id in mock_client.remote_ids
+        mock_client.delete_file.assert_not_awaited()
+
+    async def test_changed_content_drops_cache_entry(
+        self, tmp_path: Path, mock_client: AsyncMock
+    ) -> None:
+        """Deleting a remote file should also forget it in the hash cache."""
+        (tmp_path / "notes.md").write_text("v1")
+        sync = WorkspaceSync(tmp_path, "u1", openwebui_client=mock_client)
+        await sync.sync_to_openwebui()
+        old_id = sync._state.files["notes.md"].openwebui_file_id  # type: ignore[union-attr]
+
+        (tmp_path / "notes.md").write_text("v2, longer")
+        result = await sync.sync_to_openwebui()
+
+        assert result.files_uploaded == 1
+        mock_client.delete_file.assert_awaited_once_with(old_id)
+        assert old_id not in sync._state.hash_cache.values()  # type: ignore[union-attr]
+
+
+class TestSyncConcurrency:
+    """Tests for overlapping OpenWebUI calls during sync."""
+
+    async def test_deletes_run_concurrently_within_bound(
+        self, tmp_path: Path, mock_client: AsyncMock
+    ) -> None:
+        """Removed files should be deleted in parallel, at most SYNC_CONCURRENCY at once."""
+        for i in range(20):
+            (tmp_path / f"note{i}.md").write_text(f"note {i}")
+        sync = WorkspaceSync(tmp_path, "u1", openwebui_client=mock_client)
+        await sync.sync_to_openwebui()
+
+        in_flight = peak = 0
+
+        async def slow_delete(file_id: str) -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        mock_client.delete_file.side_effect = slow_delete
+        for i in range(20):
+            (tmp_path / f"note{i}.md").unlink()
+        result = await sync.sync_to_openwebui()
+
+        assert result.files_deleted == 20
+        assert 1 < peak <= SYNC_CONCURRENCY
+
+
+class TestScanReuse:
+    """Tests for handing an existing scan to sync."""
+
+    async def test_sync_without_current_files_rescans(
+        self, workspace: Path, mock_client: AsyncMock
+    ) -> None:
+        """Without an explicit scan, every sync should see the workspace as it is now."""
+        sync = WorkspaceSync(workspace, "u1", openwebui_client=mock_client)
+        await sync.refresh_index()
+        (workspace / "late.md").write_text("added after refresh")
+
+        with patch.object(sync, "scan_workspace", wraps=sync.scan_workspace) as mock_scan:
+            first = await sync.sync_to_openwebui()
+            await sync.sync_to_openwebui()
+
+        assert first.files_uploaded == 3
+        assert mock_scan.await_count == 2
+
+    async def test_explicit_current_files_skip_scan(
+        self, workspace: Path, mock_client: AsyncMock
+    ) -> None:
+        """Passing current_files should bypass scanning entirely."""
+        sync = WorkspaceSync(workspace, "u1", openwebui_client=mock_client)
+        current_files = await sync.scan_workspace()
+
+        with patch.object(sync, "scan_workspace") as mock_scan:
+            result = await sync.sync_to_openwebui(current_files=current_files)
+
+        assert result.files_uploaded == 2
+        mock_scan.assert_not_called()
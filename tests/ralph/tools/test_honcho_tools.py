@@ -0,0 +1,54 @@
+"""Tests for HonchoTools."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ralph.honcho import DialecticResponse
+from ralph.tools.honcho_tools import HonchoTools
+
+
+@pytest.fixture
+def mock_run_context() -> MagicMock:
+    """Create a mock RunContext with user_id."""
+    ctx = MagicMock()
+    ctx.user_id = "test-user-123"
+    ctx.dependencies = {}
+    return ctx
+
+
+@pytest.fixture
+def mock_honcho() -> MagicMock:
+    """Create a mock HonchoClient that answers every question."""
+    honcho = MagicMock()
+    honcho.query_dialectic = AsyncMock(
+        return_value=DialecticResponse(insight="Prefers worked examples.", query="q")
+    )
+    return honcho
+
+
+class TestQueryStudent:
+    """Tests for query_student tool."""
+
+    def test_query_without_running_loop(
+        self, mock_run_context: MagicMock, mock_honcho: MagicMock
+    ) -> None:
+        """Should answer when called from a plain thread."""
+        with patch("ralph.tools.honcho_tools.get_honcho", return_value=mock_honcho):
+            result = HonchoTools().query_student(mock_run_context, "How do they learn?")
+
+        assert result == "Prefers worked examples."
+        mock_honcho.query_dialectic.assert_awaited_once_with("test-user-123", "How do they learn?")
+
+    async def test_query_inside_running_loop(
+        self, mock_run_context: MagicMock, mock_honcho: MagicMock
+    ) -> None:
+        """Should not deadlock when called synchronously from the event loop thread."""
+        with patch("ralph.tools.honcho_tools.get_honcho", return_value=mock_honcho):
+            first = HonchoTools().query_student(mock_run_context, "one")
+            second = HonchoTools().query_student(mock_run_context, "two")
+
+        assert first == second == "Prefers worked examples."
+        assert mock_honcho.query_dialectic.await_count == 2
@@ -0,0 +1,86 @@
+"""Tests for HookedFileTools auto-compilation."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from ralph.tools import hooked_file_tools
+from ralph.tools.hooked_file_tools import HookedFileTools
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Poll until condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+@pytest.fixture
+def short_debounce() -> Iterator[None]:
+    """Shrink the debounce window so tests stay fast."""
+    with patch.object(hooked_file_tools, "COMPILE_DEBOUNCE_SECONDS", 0.05):
+        yield
+
+
+@pytest.mark.usefixtures("short_debounce")
+class TestAutoCompile:
+    """Tests for the .tex compile trigger."""
+
+    def test_burst_of_writes_compiles_once(self, tmp_path: Path) -> None:
+        """Rapid successive writes should collapse into a single compile."""
+        calls: list[Path] = []
+
+        async def fake_compile(tex_path: Path, user_id: str, chat_id: str | None) -> str:
+            calls.append(tex_path)
+            return "ok"
+
+        tools = HookedFileTools(base_dir=tmp_path, user_id="u1")
+        with patch("ralph.artifacts.compile_and_push", fake_compile):
+            for i in range(5):
+                tools.save_file(f"\\section{{v{i}}}", "notes.tex")
+            _wait_for(lambda: not hooked_file_tools.compiles_pending())
+
+        assert calls == [tmp_path / "notes.tex"]
+
+    def test_write_during_compile_queues_one_follow_up(self, tmp_path: Path) -> None:
+        """Writes landing mid-compile should trigger exactly one more compile."""
+        release = threading.Event()
+        calls: list[Path] = []
+
+        async def fake_compile(tex_path: Path, user_id: str, chat_id: str | None) -> str:
+            calls.append(tex_path)
+            await asyncio.to_thread(release.wait, 5)
+            return "ok"
+
+        tools = HookedFileTools(base_dir=tmp_path, user_id="u1")
+        with patch("ralph.artifacts.compile_and_push", fake_compile):
+            tools.save_file("v1", "notes.tex")
+            _wait_for(lambda: len(calls) == 1)
+            # Both writes outlast the debounce while the first compile is still running
+            tools.save_file("v2", "notes.tex")
+            time.sleep(0.2)
+            tools.save_file("v3", "notes.tex")
+            time.sleep(0.2)
+            release.set()
+            _wait_for(lambda: not hooked_file_tools.compiles_pending())
+
+        assert calls == [tmp_path / "notes.tex"] * 2
+
+    def test_non_tex_files_do_not_compile(self, tmp_path: Path) -> None:
+        """Should only compile .tex files."""
+        tools = HookedFileTools(base_dir=tmp_path, user_id="u1")
+        with patch.object(HookedFileTools, "_trigger_compile") as mock_trigger:
+            tools.save_file("hello", "notes.md")
+
+        mock_trigger.assert_not_called()
@@ -1,8 +1,24 @@
 """Tests for LaTeX templates and artifact compilation."""
 
+# These tests exercise the compile and viewer helpers behind compile_and_push directly
+# pyright: reportPrivateUsage=false
+
 from __future__ import annotations
 
-from ralph.tools.latex_templates import PDF_VIEWER_TEMPLATE
+import base64
+import html
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ralph.artifacts import _build_viewer, _compile_latex, _escape_html
+from ralph.tools.latex_templates import COMPILE_ERROR_TEMPLATE, PDF_VIEWER_TEMPLATE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 
 class TestTemplates:
@@ -16,3 +32,199 @@ class TestTemplates:
         """Test that PDF viewer includes PDF.js rendering logic."""
         assert "pdfjsLib" in PDF_VIEWER_TEMPLATE
         assert "renderAllPages" in PDF_VIEWER_TEMPLATE
+
+    def test_viewer_template_decodes_pdf_natively(self) -> None:
+        """Test that the viewer prefers native base64 decoding over a JS byte loop."""
+        assert "Uint8Array.fromBase64" in PDF_VIEWER_TEMPLATE
+        assert "data:application/pdf;base64," in PDF_VIEWER_TEMPLATE
+
+    def test_viewer_template_preloads_worker(self) -> None:
+        """Test that the PDF.js worker is fetched alongside the main script."""
+        assert 'rel="preconnect"' in PDF_VIEWER_TEMPLATE
+        assert 'rel="preload" as="script"' in PDF_VIEWER_TEMPLATE
+
+    def test_viewer_template_renders_pages_lazily(self) -> None:
+        """Test that pages render on scroll into view under a fixed bound."""
+        assert "IntersectionObserver" in PDF_VIEWER_TEMPLATE
+        assert "page-placeholder" in PDF_VIEWER_TEMPLATE
+        assert "MAX_CONCURRENT_RENDERS" in PDF_VIEWER_TEMPLATE
+
+    def test_viewer_template_caps_render_dpr(self) -> None:
+        """Test that canvas resolution is bounded on HiDPI displays."""
+        assert "Math.min(window.devicePixelRatio || 1, MAX_RENDER_DPR)" in PDF_VIEWER_TEMPLATE
+
+    def test_error_template_fills_message(self) -> None:
+        """Test that the compile error page embeds the message in a <pre> block."""
+        page = COMPILE_ERROR_TEMPLATE.substitute(message="! Missing $ inserted.")
+
+        assert "<pre" in page
+        assert "! Missing $ inserted." in page
+
+
+class TestBuildViewer:
+    """Tests for assembling the PDF viewer page."""
+
+    def test_matches_percent_formatting(self) -> None:
+        """The pre-split template should render exactly like %-formatting."""
+        pdf_bytes = b"%PDF-1.5 fake"
+        expected = PDF_VIEWER_TEMPLATE % {
+            "title": "Week 1 Notes",
+            "pdf_base64": base64.b64encode(pdf_bytes).decode("ascii"),
+        }
+
+        assert _build_viewer(pdf_bytes, "Week 1 Notes") == expected
+
+    def test_chunked_base64_matches_one_shot(self) -> None:
+        """PDFs spanning several encode chunks should embed the same base64."""
+        pdf_bytes = bytes(range(256)) * 2000 + b"tail"
+
+        page = _build_viewer(pdf_bytes, "Big")
+
+        assert base64.b64encode(pdf_bytes).decode("ascii") in page
+
+    def test_title_is_html_escaped(self) -> None:
+        """Titles from filenames should not inject markup or trip on %."""
+        page = _build_viewer(b"%PDF", "Q&A <draft> 100%")
+
+        assert "<title>Q&amp;A &lt;draft&gt; 100%</title>" in page
+
+
+class TestEscaping:
+    """Tests for escaping text embedded in artifact HTML."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "plain",
+            "<script>alert('x')</script>",
+            'a & b "quoted"',
+            "! Undefined control sequence <>",
+        ],
+    )
+    def test_escape_html_matches_stdlib(self, text: str) -> None:
+        """Should produce the same output as html.escape."""
+        assert _escape_html(text) == html.escape(text, quote=True)
+
+
+class TestCompileCache:
+    """Tests for memoized LaTeX compilation."""
+
+    @pytest.fixture
+    def tectonic(self) -> Iterator[list[tuple[str, ...]]]:
+        """Fake tectonic that writes a PDF next to the source."""
+        calls: list[tuple[str, ...]] = []
+
+        async def fake_exec(*args: str, **_: object) -> MagicMock:
+            calls.append(args)
+            Path(args[-1]).with_suffix(".pdf").write_bytes(b"%PDF-1.5 " + str(len(calls)).encode())
+            proc = MagicMock(returncode=0)
+            proc.communicate = AsyncMock(return_value=(None, b""))
+            return proc
+
+        with patch("ralph.artifacts.asyncio.create_subprocess_exec", fake_exec):
+            yield calls
+
+    async def test_unchanged_source_skips_compiler(
+        self, tmp_path: Path, tectonic: list[tuple[str, ...]]
+    ) -> None:
+        """Recompiling identical source should reuse the cached PDF."""
+        tex = tmp_path / "notes.tex"
+        tex.write_text("\\documentclass{article}")
+
+        first = await _compile_latex(tex)
+        (tmp_path / "notes.pdf").unlink()
+        second = await _compile_latex(tex)
+
+        assert first == second == b"%PDF-1.5 1"
+        assert (tmp_path / "notes.pdf").read_bytes() == first
+        assert len(tectonic) == 1
+
+    async def test_edited_source_recompiles(
+        self, tmp_path: Path, tectonic: list[tuple[str, ...]]
+    ) -> None:
+        """Changing the source should miss the cache."""
+        tex = tmp_path / "notes.tex"
+        tex.write_text("v1")
+        await _compile_latex(tex)
+        tex.write_text("v2")
+
+        assert await _compile_latex(tex) == b"%PDF-1.5 2"
+
+    async def test_documents_with_inputs_are_not_cached(
+        self, tmp_path: Path, tectonic: list[tuple[str, ...]]
+    ) -> None:
+        """Sources that pull in other files should always recompile."""
+        tex = tmp_path / "notes.tex"
+        tex.write_text("\\input{chapter1}")
+        await _compile_latex(tex)
+        await _compile_latex(tex)
+
+        assert len(tectonic) == 2
+        assert not (tmp_path / ".latex_cache").exists()
+
+    @pytest.mark.parametrize("command", ["\\includesvg{fig}", "\\inputminted{python}{a.py}"])
+    async def test_other_input_commands_are_not_cached(
+        self, tmp_path: Path, tectonic: list[tuple[str, ...]], command: str
+    ) -> None:
+        """Less common file-reading commands should also disable the cache."""
+        tex = tmp_path / "notes.tex"
+        tex.write_text(command)
+        await _compile_latex(tex)
+
+        assert not (tmp_path / ".latex_cache").exists()
+
+    async def test_local_package_disables_cache(
+        self, tmp_path: Path, tectonic: list[tuple[str, ...]]
+    ) -> None:
+        """A .sty beside the source can change the output without changing the source."""
+        tex = tmp_path / "notes.tex"
+        tex.write_text("\\usepackage{mystyle}")
+        (tmp_path / "mystyle.sty").write_text("v1")
+        await _compile_latex(tex)
+        (tmp_path / "mystyle.sty").write_text("v2")
+        await _compile_latex(tex)
+
+        assert len(tectonic) == 2
+        assert not (tmp_path / ".latex_cache").exists()
+
+    async def test_unrelated_siblings_keep_cache(
+        self, tmp_path: Path, tectonic: list[tuple[str, ...]]
+    ) -> None:
+        """Other documents and unused styles beside the source shouldn't disable the cache."""
+        tex = tmp_path / "notes.tex"
+        tex.write_text("\\documentclass{article}\\usepackage{amsmath}")
+        (tmp_path / "homework.tex").write_text("other document")
+        (tmp_path / "unused.sty").write_text("")
+        await _compile_latex(tex)
+        await _compile_latex(tex)
+
+        assert len(tectonic) == 1
+
+    async def test_cache_hit_refreshes_entry(
+        self, tmp_path: Path, tectonic: list[tuple[str, ...]]
+    ) -> None:
+        """Reusing a cached PDF should mark it recently used for eviction."""
+        tex = tmp_path / "notes.tex"
+        tex.write_text("v1")
+        await _compile_latex(tex)
+        (entry,) = (tmp_path / ".latex_cache").glob("*.pdf")
+        os.utime(entry, (0, 0))
+
+        await _compile_latex(tex)
+
+        assert entry.stat().st_mtime > 0
+        assert len(tectonic) == 1
+
+    async def test_failure_reports_error_lines(self, tmp_path: Path) -> None:
+        """A failing compile should surface only the compiler's error lines."""
+        tex = tmp_path / "notes.tex"
+        tex.write_text("\\input{missing}")
+        proc = MagicMock(returncode=1)
+        proc.communicate = AsyncMock(
+            return_value=(None, b"note: running TeX\nerror: missing.tex not found\n\xff")
+        )
+
+        with patch("ralph.artifacts.asyncio.create_subprocess_exec", AsyncMock(return_value=proc)):
+            result = await _compile_latex(tex)
+
+        assert result == "LaTeX compilation failed:\n```\nerror: missing.tex not found\n```"
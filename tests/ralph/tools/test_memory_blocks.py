@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from ralph.dolt import MemoryBlock
+from ralph.dolt import DoltConnectionError, MemoryBlock
+from ralph.tools import memory_blocks
 from ralph.tools.memory_blocks import MemoryBlockTools
 
 
@@ -37,19 +39,108 @@ def tools() -> MemoryBlockTools:
 
 
 def make_run_async_mock(mock_dolt: MagicMock) -> Any:
-    """Create a mock for _run_async_with_fresh_client that injects mock_dolt."""
+    """Create a mock for _run_with_pooled_client that injects mock_dolt."""
 
-    def _mock_run(async_fn: Any) -> Any:
+    def _mock_run(async_fn: Any, **_: Any) -> Any:
         import asyncio
 
         async def _execute() -> Any:
             return await async_fn(mock_dolt)
 
-        return asyncio.get_event_loop().run_until_complete(_execute())
+        return asyncio.run(_execute())
 
     return _mock_run
 
 
+class TestPooledClient:
+    """Tests for the shared DoltClient used by the tools."""
+
+    def test_calls_share_one_connected_client(
+        self, mock_run_context: MagicMock, mock_dolt: MagicMock
+    ) -> None:
+        """Successive tool calls should reuse a single connection pool."""
+        mock_dolt.get_blocks = AsyncMock(return_value={})
+
+        with (
+            patch.object(memory_blocks, "_dolt_client", None),
+            patch.object(memory_blocks, "DoltClient", return_value=mock_dolt),
+        ):
+            # Separate toolkits, so no call is served from the block cache
+            results = [MemoryBlockTools().list_memory_blocks(mock_run_context) for _ in range(3)]
+
+        assert all("No memory blocks exist" in result for result in results)
+        assert mock_dolt.get_blocks.await_count == 3
+        mock_dolt.connect.assert_awaited_once()
+        mock_dolt.disconnect.assert_not_awaited()
+
+    def test_dropped_connection_retries_read_on_new_pool(
+        self, tools: MemoryBlockTools, mock_run_context: MagicMock
+    ) -> None:
+        """A connection error during a read should rebuild the shared client and retry once."""
+        stale, fresh = MagicMock(), MagicMock()
+        for client in (stale, fresh):
+            client.connect = AsyncMock()
+            client.disconnect = AsyncMock()
+        stale.get_blocks = AsyncMock(side_effect=DoltConnectionError("server has gone away"))
+        fresh.get_blocks = AsyncMock(return_value={})
+
+        with (
+            patch.object(memory_blocks, "_dolt_client", None),
+            patch.object(memory_blocks, "DoltClient", side_effect=[stale, fresh]),
+        ):
+            result = tools.list_memory_blocks(mock_run_context)
+
+        assert "No memory blocks exist" in result
+        stale.disconnect.assert_awaited_once()
+        fresh.connect.assert_awaited_once()
+
+    async def test_close_disconnects_shared_client(
+        self, mock_run_context: MagicMock, mock_dolt: MagicMock
+    ) -> None:
+        """Shutdown should disconnect the pooled client; the next call reconnects."""
+        mock_dolt.get_blocks = AsyncMock(return_value={})
+
+        with (
+            patch.object(memory_blocks, "_dolt_client", None),
+            patch.object(memory_blocks, "DoltClient", return_value=mock_dolt),
+        ):
+            await asyncio.to_thread(MemoryBlockTools().list_memory_blocks, mock_run_context)
+            await memory_blocks.close_pooled_client()
+            mock_dolt.disconnect.assert_awaited_once()
+
+            await asyncio.to_thread(MemoryBlockTools().list_memory_blocks, mock_run_context)
+
+        assert mock_dolt.connect.await_count == 2
+
+    def test_dropped_proposal_is_not_replayed(
+        self, tools: MemoryBlockTools, mock_run_context: MagicMock, mock_dolt: MagicMock
+    ) -> None:
+        """A write may have committed before the drop, so it must not run twice."""
+        mock_dolt.get_block = AsyncMock(
+            return_value=MemoryBlock(
+                user_id="test-user-123",
+                label="student",
+                title=None,
+                body="The student likes math.",
+                schema_ref=None,
+                updated_at=datetime.now(UTC),
+            )
+        )
+        mock_dolt.create_proposal = AsyncMock(side_effect=DoltConnectionError("gone away"))
+
+        with (
+            patch.object(memory_blocks, "_dolt_client", None),
+            patch.object(memory_blocks, "DoltClient", return_value=mock_dolt),
+        ):
+            result = tools.propose_memory_edit(
+                mock_run_context, "student", "likes", "loves", "Stronger wording"
+            )
+
+        assert "Error creating edit proposal" in result
+        mock_dolt.create_proposal.assert_awaited_once()
+        mock_dolt.disconnect.assert_awaited_once()
+
+
 class TestListMemoryBlocks:
     """Tests for list_memory_blocks tool."""
 
@@ -57,9 +148,9 @@ class TestListMemoryBlocks:
         self, tools: MemoryBlockTools, mock_run_context: MagicMock, mock_dolt: MagicMock
     ) -> None:
         """Should return formatted list of blocks."""
-        mock_dolt.list_blocks = AsyncMock(
-            return_value=[
-                MemoryBlock(
+        mock_dolt.get_blocks = AsyncMock(
+            return_value={
+                "student": MemoryBlock(
                     user_id="test-user-123",
                     label="student",
                     title="Student Profile",
@@ -67,7 +158,7 @@ class TestListMemoryBlocks:
                     schema_ref=None,
                     updated_at=datetime.now(UTC),
                 ),
-                MemoryBlock(
+                "goals": MemoryBlock(
                     user_id="test-user-123",
                     label="goals",
                     title="Learning Goals",
@@ -75,11 +166,11 @@ class TestListMemoryBlocks:
                     schema_ref=None,
                     updated_at=datetime.now(UTC),
                 ),
-            ]
+            }
         )
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.list_memory_blocks(mock_run_context)
@@ -91,10 +182,10 @@ class TestListMemoryBlocks:
         self, tools: MemoryBlockTools, mock_run_context: MagicMock, mock_dolt: MagicMock
     ) -> None:
         """Should handle no blocks gracefully."""
-        mock_dolt.list_blocks = AsyncMock(return_value=[])
+        mock_dolt.get_blocks = AsyncMock(return_value={})
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.list_memory_blocks(mock_run_context)
@@ -119,19 +210,21 @@ class TestReadMemoryBlock:
         self, tools: MemoryBlockTools, mock_run_context: MagicMock, mock_dolt: MagicMock
     ) -> None:
         """Should return block content with title."""
-        mock_dolt.get_block = AsyncMock(
-            return_value=MemoryBlock(
-                user_id="test-user-123",
-                label="student",
-                title="Student Profile",
-                body="## About\n\nTest content here.",
-                schema_ref=None,
-                updated_at=datetime.now(UTC),
-            )
+        mock_dolt.get_blocks = AsyncMock(
+            return_value={
+                "student": MemoryBlock(
+                    user_id="test-user-123",
+                    label="student",
+                    title="Student Profile",
+                    body="## About\n\nTest content here.",
+                    schema_ref=None,
+                    updated_at=datetime.now(UTC),
+                )
+            }
         )
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.read_memory_block(mock_run_context, "student")
@@ -143,16 +236,69 @@ class TestReadMemoryBlock:
         self, tools: MemoryBlockTools, mock_run_context: MagicMock, mock_dolt: MagicMock
     ) -> None:
         """Should return error for missing block."""
-        mock_dolt.get_block = AsyncMock(return_value=None)
+        mock_dolt.get_blocks = AsyncMock(return_value={})
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.read_memory_block(mock_run_context, "nonexistent")
 
         assert "not found" in result
 
+    def test_list_then_reads_share_one_query(
+        self, tools: MemoryBlockTools, mock_run_context: MagicMock, mock_dolt: MagicMock
+    ) -> None:
+        """Listing and reading within the TTL should fetch blocks once."""
+        block = MemoryBlock(
+            user_id="test-user-123",
+            label="student",
+            title="Student Profile",
+            body="The student likes math.",
+            schema_ref=None,
+            updated_at=datetime.now(UTC),
+        )
+        # Approved elsewhere after this turn's read; the proposal must build on it
+        current = MemoryBlock(
+            user_id="test-user-123",
+            label="student",
+            title="Student Profile",
+            body="The student likes math. Prefers mornings.",
+            schema_ref=None,
+            updated_at=datetime.now(UTC),
+        )
+        mock_dolt.get_blocks = AsyncMock(return_value={"student": block})
+        mock_dolt.get_block = AsyncMock(return_value=current)
+        mock_dolt.create_proposal = AsyncMock(return_value="agent/test-user-123/student")
+
+        with patch(
+            "ralph.tools.memory_blocks._run_with_pooled_client",
+            make_run_async_mock(mock_dolt),
+        ):
+            tools.list_memory_blocks(mock_run_context)
+            first = tools.read_memory_block(mock_run_context, "student")
+            second = tools.read_memory_block(mock_run_context, "student")
+            missing = tools.read_memory_block(mock_run_context, "goals")
+            tools.propose_memory_edit(
+                mock_run_context,
+                block_label="student",
+                old_string="likes math",
+                new_string="loves mathematics",
+                reasoning="Student expressed stronger enthusiasm",
+            )
+            assert mock_dolt.get_blocks.await_count == 1
+            # Proposals always re-read the block rather than trusting the cache
+            mock_dolt.get_block.assert_awaited_once()
+
+            # The proposal invalidates the cached blocks
+            tools.read_memory_block(mock_run_context, "student")
+
+        assert first == second
+        assert "not found" in missing
+        assert mock_dolt.get_blocks.await_count == 2
+        new_body = mock_dolt.create_proposal.call_args.kwargs["new_body"]
+        assert new_body == "The student loves mathematics. Prefers mornings."
+
 
 class TestProposeMemoryEdit:
     """Tests for propose_memory_edit tool."""
@@ -174,7 +320,7 @@ class TestProposeMemoryEdit:
         mock_dolt.create_proposal = AsyncMock(return_value="agent/test-user-123/student")
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.propose_memory_edit(
@@ -206,7 +352,7 @@ class TestProposeMemoryEdit:
         )
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.propose_memory_edit(
@@ -236,7 +382,7 @@ class TestProposeMemoryEdit:
         )
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.propose_memory_edit(
@@ -267,7 +413,7 @@ class TestProposeMemoryEdit:
         mock_dolt.create_proposal = AsyncMock(return_value="agent/test-user-123/student")
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.propose_memory_edit(
@@ -334,7 +480,7 @@ class TestProposeMemoryEdit:
         mock_dolt.get_block = AsyncMock(return_value=None)
 
         with patch(
-            "ralph.tools.memory_blocks._run_async_with_fresh_client",
+            "ralph.tools.memory_blocks._run_with_pooled_client",
             make_run_async_mock(mock_dolt),
         ):
             result = tools.propose_memory_edit(
@@ -346,3 +492,34 @@ class TestProposeMemoryEdit:
             )
 
         assert "not found" in result.lower()
+
+    def test_propose_edit_mismatch_on_cached_block_skips_dolt(
+        self, tools: MemoryBlockTools, mock_run_context: MagicMock, mock_dolt: MagicMock
+    ) -> None:
+        """A non-matching edit against a freshly read block should fail locally."""
+        mock_dolt.get_blocks = AsyncMock(
+            return_value={
+                "student": MemoryBlock(
+                    user_id="test-user-123",
+                    label="student",
+                    title="Student Profile",
+                    body="The student likes math.",
+                    schema_ref=None,
+                    updated_at=datetime.now(UTC),
+                )
+            }
+        )
+        run = MagicMock(side_effect=make_run_async_mock(mock_dolt))
+
+        with patch("ralph.tools.memory_blocks._run_with_pooled_client", run):
+            tools.read_memory_block(mock_run_context, "student")
+            result = tools.propose_memory_edit(
+                mock_run_context,
+                block_label="student",
+                old_string="likes science",
+                new_string="loves science",
+                reasoning="test",
+            )
+
+        assert "not found" in result.lower()
+        assert run.call_count == 1